@@ -3,43 +3,111 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, PLATFORMS
+from .const import CONF_FLEET, DATA_FLEET, DOMAIN, FLEET_PLATFORMS, PLATFORMS
 from .coordinator import EverUPSCoordinator
+from .fleet import FleetCoordinator
+from .profile import async_get_profiles
+from .services import async_setup_services
+from .storage import async_remove_entry_stores
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Ever Powerline UPS integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Ever Powerline UPS from a config entry."""
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
+    if entry.data.get(CONF_FLEET):
+        return await _async_setup_fleet_entry(hass, entry)
+
+    coordinator = EverUPSCoordinator(hass, entry, await async_get_profiles(hass))
+    await coordinator.battery_test.async_load()
+    await coordinator.battery_health.async_load()
+    await coordinator.power_quality.async_load()
+    if coordinator.statistics is not None:
+        await coordinator.statistics.async_load()
 
-    coordinator = EverUPSCoordinator(hass, host, port)
-    
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
 
+    # Find out once which registers this model implements
+    await coordinator.async_probe_capabilities()
+
     # Store coordinator in runtime data
     entry.runtime_data = coordinator
 
+    # Poll on this device's own phase of the interval
+    coordinator.async_start_polling()
+
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    if (fleet := hass.data.get(DOMAIN, {}).get(DATA_FLEET)) is not None:
+        fleet.async_add_device(coordinator)
+
     return True
 
 
+async def _async_setup_fleet_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up the site totals of all UPS entries."""
+    fleet = FleetCoordinator(hass, entry)
+    hass.data.setdefault(DOMAIN, {})[DATA_FLEET] = fleet
+    # UPS entries set up later add themselves
+    for ups_entry in hass.config_entries.async_entries(DOMAIN):
+        if ups_entry.state is ConfigEntryState.LOADED and isinstance(
+            ups_entry.runtime_data, EverUPSCoordinator
+        ):
+            fleet.async_add_device(ups_entry.runtime_data)
+
+    entry.runtime_data = fleet
+    await hass.config_entries.async_forward_entry_setups(entry, FLEET_PLATFORMS)
+    return True
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    coordinator: EverUPSCoordinator = entry.runtime_data
+    if dict(entry.options) != coordinator.options:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if entry.data.get(CONF_FLEET):
+        unload_ok = await hass.config_entries.async_unload_platforms(
+            entry, FLEET_PLATFORMS
+        )
+        if unload_ok:
+            entry.runtime_data.async_close()
+            hass.data[DOMAIN].pop(DATA_FLEET, None)
+        return unload_ok
+
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
         # Close the coordinator connection
         coordinator: EverUPSCoordinator = entry.runtime_data
+        if (fleet := hass.data.get(DOMAIN, {}).get(DATA_FLEET)) is not None:
+            fleet.async_remove_device(entry.entry_id)
         await coordinator.async_close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted entry."""
+    await async_remove_entry_stores(hass, entry)
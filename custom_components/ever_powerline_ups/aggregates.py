@@ -0,0 +1,114 @@
+"""Rolling window aggregates for Ever Powerline UPS.
+
+Minimum and maximum are kept with monotonic deques and the mean with a
+running sum, so adding a sample is amortised O(1) whatever the window
+length. The aggregate values are published once per window, which lets
+the raw high-churn sensors be left out of the recorder.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+# Measurements aggregated by the coordinator
+AGGREGATE_KEYS: tuple[str, ...] = (
+    "input_voltage_l1",
+    "output_voltage_l1",
+    "load_total",
+    "active_power_total",
+)
+AGGREGATE_STATS: tuple[str, ...] = ("min", "max", "mean")
+
+
+class WindowAggregate:
+    """Minimum, maximum and mean of the samples of the last ``window`` seconds."""
+
+    def __init__(self, window: float) -> None:
+        """Initialize the window."""
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        # Candidates for the minimum, values increasing from the left, and
+        # for the maximum, values decreasing from the left
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample and drop the ones that left the window."""
+        self._samples.append((timestamp, value))
+        self._sum += value
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp, value))
+        self.expire(timestamp)
+
+    def expire(self, now: float) -> None:
+        """Drop samples older than the window."""
+        cutoff = now - self.window
+        samples = self._samples
+        while samples and samples[0][0] <= cutoff:
+            self._sum -= samples.popleft()[1]
+        if not samples:
+            # Start over from zero instead of carrying rounding errors
+            self._sum = 0.0
+        while self._min and self._min[0][0] <= cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= cutoff:
+            self._max.popleft()
+
+    @property
+    def min(self) -> float | None:
+        """Return the minimum, None for an empty window."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> float | None:
+        """Return the maximum, None for an empty window."""
+        return self._max[0][1] if self._max else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean, None for an empty window."""
+        return self._sum / len(self._samples) if self._samples else None
+
+
+class MeasurementAggregates:
+    """Rolling aggregates of the measurements in AGGREGATE_KEYS."""
+
+    def __init__(self, window: float) -> None:
+        """Initialize the aggregates."""
+        self.window = window
+        self._windows = {key: WindowAggregate(window) for key in AGGREGATE_KEYS}
+        self._next_publish: float | None = None
+        self.values: dict[str, Any] = {
+            f"{key}_{stat}": None for key in AGGREGATE_KEYS for stat in AGGREGATE_STATS
+        }
+
+    def add(self, data: dict[str, Any], timestamp: float) -> None:
+        """Add the measurements of a fresh poll, publishing at window ends."""
+        for key, window in self._windows.items():
+            if (value := data.get(key)) is not None:
+                window.add(timestamp, value)
+
+        if self._next_publish is None:
+            # Publish on multiples of the window length
+            self._next_publish = (timestamp // self.window + 1) * self.window
+        elif timestamp >= self._next_publish:
+            self._publish(timestamp)
+            self._next_publish += self.window * (
+                (timestamp - self._next_publish) // self.window + 1
+            )
+
+    def _publish(self, now: float) -> None:
+        """Copy the current aggregates to the published values."""
+        for key, window in self._windows.items():
+            window.expire(now)
+            for stat in AGGREGATE_STATS:
+                value = getattr(window, stat)
+                self.values[f"{key}_{stat}"] = (
+                    None if value is None else round(value, 1)
+                )
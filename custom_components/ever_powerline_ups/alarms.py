@@ -0,0 +1,206 @@
+"""Warning bit tracking for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    WARNING_BATTERY_OPEN,
+    WARNING_BATTERY_OVER_CHARGE,
+    WARNING_BYPASS_ABNORMAL,
+    WARNING_BYPASS_ON,
+    WARNING_BYPASS_PHASE_ERROR,
+    WARNING_CHARGER_FAULT,
+    WARNING_COMMUNICATION_LOST,
+    WARNING_EPO_ACTIVE,
+    WARNING_FAN_LOCK,
+    WARNING_GOING_SHUTDOWN,
+    WARNING_LOW_BATTERY,
+    WARNING_MAIN_NEUTRAL_LOSS,
+    WARNING_MAIN_PHASE_ERROR,
+    WARNING_MAINTENANCE_COVER_OPEN,
+    WARNING_ON_BATTERY,
+    WARNING_OVER_TEMPERATURE,
+    WARNING_OVERLOAD,
+    WARNING_OVERLOAD_WARNING,
+    WARNING_POWER_FAIL,
+    WARNING_SITE_FAULT,
+    WARNING_TEST_IN_PROGRESS,
+    WARNING_UPS_FAILED,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class WarningBit:
+    """One bit of the warning block, keyed like its binary sensor."""
+
+    key: str
+    register: str
+    mask: int
+
+
+WARNING_BITS: tuple[WarningBit, ...] = (
+    # Register 0x0060
+    WarningBit("power_fail", "warnings_0", WARNING_POWER_FAIL),
+    WarningBit("low_battery", "warnings_0", WARNING_LOW_BATTERY),
+    WarningBit("ups_failed", "warnings_0", WARNING_UPS_FAILED),
+    WarningBit("on_battery", "warnings_0", WARNING_ON_BATTERY),
+    WarningBit("test_in_progress", "warnings_0", WARNING_TEST_IN_PROGRESS),
+    WarningBit("bypass_active", "warnings_0", WARNING_BYPASS_ON),
+    WarningBit("communication_lost", "warnings_0", WARNING_COMMUNICATION_LOST),
+    WarningBit("going_shutdown", "warnings_0", WARNING_GOING_SHUTDOWN),
+    WarningBit("over_temperature", "warnings_0", WARNING_OVER_TEMPERATURE),
+    WarningBit("overload", "warnings_0", WARNING_OVERLOAD),
+    # Register 0x0061
+    WarningBit("epo_active", "warnings_1", WARNING_EPO_ACTIVE),
+    WarningBit("main_neutral_loss", "warnings_1", WARNING_MAIN_NEUTRAL_LOSS),
+    WarningBit("main_phase_error", "warnings_1", WARNING_MAIN_PHASE_ERROR),
+    WarningBit("site_fault", "warnings_1", WARNING_SITE_FAULT),
+    WarningBit("bypass_abnormal", "warnings_1", WARNING_BYPASS_ABNORMAL),
+    WarningBit("bypass_phase_error", "warnings_1", WARNING_BYPASS_PHASE_ERROR),
+    WarningBit("battery_open", "warnings_1", WARNING_BATTERY_OPEN),
+    WarningBit("battery_over_charge", "warnings_1", WARNING_BATTERY_OVER_CHARGE),
+    # Register 0x0062
+    WarningBit("overload_warning", "warnings_2", WARNING_OVERLOAD_WARNING),
+    WarningBit("fan_fault", "warnings_2", WARNING_FAN_LOCK),
+    WarningBit("maintenance_cover_open", "warnings_2", WARNING_MAINTENANCE_COVER_OPEN),
+    WarningBit("charger_fault", "warnings_2", WARNING_CHARGER_FAULT),
+)
+
+# Warnings a host shutdown depends on, watched between polls
+CRITICAL_WARNINGS: frozenset[str] = frozenset(
+    {"power_fail", "low_battery", "going_shutdown"}
+)
+
+WARNING_REGISTERS: tuple[str, ...] = ("warnings_0", "warnings_1", "warnings_2")
+
+_BITS_BY_REGISTER: dict[str, tuple[WarningBit, ...]] = {
+    register: tuple(bit for bit in WARNING_BITS if bit.register == register)
+    for register in WARNING_REGISTERS
+}
+
+_CRITICAL_BITS = tuple(bit for bit in WARNING_BITS if bit.key in CRITICAL_WARNINGS)
+
+
+@dataclass(frozen=True, slots=True)
+class WarningChange:
+    """A warning that was raised or cleared."""
+
+    key: str
+    active: bool
+
+
+class WarningTracker:
+    """Track the warning words and report which warnings changed.
+
+    Each word is XORed against the previous read once, so only the bits
+    that actually changed are looked at. Warnings listed as debounced only
+    change state once the raw bit has held its new value for the assert
+    (raise) or clear delay, checked on every read; a bit that flips back
+    sooner is counted as suppressed. Other warnings follow the raw bits.
+    """
+
+    def __init__(
+        self,
+        *,
+        debounced: Iterable[str] = (),
+        assert_delay: float = 0.0,
+        clear_delay: float = 0.0,
+    ) -> None:
+        """Initialize the tracker."""
+        self._debounced = frozenset(debounced)
+        self._assert_delay = assert_delay
+        self._clear_delay = clear_delay
+        self._words: dict[str, int] | None = None
+        self._raw: set[str] = set()
+        self._active: set[str] = set()
+        # Debounced warnings whose raw bit differs from their state, and since when
+        self._pending: dict[str, float] = {}
+        self.transitions: dict[str, int] = {}
+        self.suppressed: dict[str, int] = {}
+
+    def critical_changed(self, words: Mapping[str, int]) -> bool:
+        """Return True if a critical warning bit differs from the last read."""
+        if self._words is None:
+            return False
+        return any(
+            (words[bit.register] ^ self._words[bit.register]) & bit.mask
+            for bit in _CRITICAL_BITS
+        )
+
+    @property
+    def active(self) -> list[str]:
+        """Return the keys of the active (debounced) warnings."""
+        return sorted(self._active)
+
+    def update(self, words: Mapping[str, int], now: float) -> list[WarningChange]:
+        """Take a new read of the warning words and return the changes.
+
+        The first read only sets the baseline, so warnings that are already
+        active at startup are not reported as raised.
+        """
+        previous = self._words
+        self._words = {register: words[register] for register in WARNING_REGISTERS}
+        if previous is None:
+            self._raw = {
+                bit.key
+                for bit in WARNING_BITS
+                if self._words[bit.register] & bit.mask
+            }
+            self._active = set(self._raw)
+            return []
+
+        changes: list[WarningChange] = []
+        for register, word in self._words.items():
+            if not (changed := word ^ previous[register]):
+                continue
+            for bit in _BITS_BY_REGISTER[register]:
+                if changed & bit.mask:
+                    self._raw_changed(bit.key, bool(word & bit.mask), now, changes)
+
+        for key, since in list(self._pending.items()):
+            raised = key in self._raw
+            delay = self._assert_delay if raised else self._clear_delay
+            if now - since >= delay:
+                del self._pending[key]
+                self._set_active(key, raised, changes)
+        return changes
+
+    def _raw_changed(
+        self, key: str, raw: bool, now: float, changes: list[WarningChange]
+    ) -> None:
+        """Apply a change of one raw warning bit."""
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        if raw:
+            self._raw.add(key)
+        else:
+            self._raw.discard(key)
+
+        if key not in self._debounced:
+            self._set_active(key, raw, changes)
+        elif raw == (key in self._active):
+            # Flipped back before its hold time ran out
+            if self._pending.pop(key, None) is not None:
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+        else:
+            self._pending[key] = now
+
+    def _set_active(self, key: str, active: bool, changes: list[WarningChange]) -> None:
+        """Change the state of a warning and record the change."""
+        if active:
+            self._active.add(key)
+        else:
+            self._active.discard(key)
+        changes.append(WarningChange(key, active))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the raw and debounced state for diagnostics."""
+        return {
+            "raw": sorted(self._raw),
+            "active": self.active,
+            "pending": sorted(self._pending),
+            "transitions": dict(self.transitions),
+            "suppressed": dict(self.suppressed),
+        }
@@ -0,0 +1,203 @@
+"""Battery health tracking for Ever Powerline UPS.
+
+Health indicators are kept as exponentially weighted running statistics fed
+from every poll, so each sample costs a handful of float operations and the
+whole state is a few numbers that are stored across restarts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import math
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import BATTERY_HEALTH_SAVE_INTERVAL, BatteryTestResult, OperatingMode
+from .storage import STORE_BATTERY_HEALTH, entry_store
+
+DAY = 86400.0
+
+_ON_BATTERY = (OperatingMode.BATTERY, OperatingMode.BATTERY_TEST)
+
+
+@dataclass(slots=True)
+class DecayingStats:
+    """Exponentially weighted mean and variance with a time based half-life."""
+
+    half_life: float
+    weight: float = 0.0
+    mean: float = 0.0
+    variance: float = 0.0
+    last: float | None = None
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample taken at ``timestamp`` (seconds)."""
+        if self.last is not None:
+            self.weight *= 0.5 ** (max(0.0, timestamp - self.last) / self.half_life)
+        self.last = timestamp
+        self.weight += 1.0
+        delta = value - self.mean
+        self.mean += delta / self.weight
+        self.variance += (delta * (value - self.mean) - self.variance) / self.weight
+
+    @property
+    def value(self) -> float | None:
+        """Return the mean, None before the first sample."""
+        return None if self.last is None else self.mean
+
+    @property
+    def std(self) -> float | None:
+        """Return the standard deviation, None before the first sample."""
+        return None if self.last is None else math.sqrt(max(0.0, self.variance))
+
+
+@dataclass(slots=True)
+class DecayingTrend:
+    """Exponentially weighted least squares line through time series samples.
+
+    Only the weighted sums are kept, so adding a sample and reading the
+    slope are constant time. Times are kept relative to ``origin`` to stay
+    well inside float precision.
+    """
+
+    half_life: float
+    origin: float | None = None
+    last: float = 0.0
+    sw: float = 0.0
+    st: float = 0.0
+    sy: float = 0.0
+    stt: float = 0.0
+    sty: float = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample taken at ``timestamp`` (seconds)."""
+        if self.origin is None:
+            self.origin = timestamp
+        t = (timestamp - self.origin) / DAY
+        decay = 0.5 ** (max(0.0, t - self.last) * DAY / self.half_life)
+        self.last = t
+        self.sw = self.sw * decay + 1.0
+        self.st = self.st * decay + t
+        self.sy = self.sy * decay + value
+        self.stt = self.stt * decay + t * t
+        self.sty = self.sty * decay + t * value
+
+    @property
+    def slope(self) -> float | None:
+        """Return the slope per day, None until the samples span some time."""
+        denominator = self.sw * self.stt - self.st * self.st
+        # Samples spread over less than about a day say nothing about a trend
+        if self.sw < 2 or denominator < 0.1 * self.sw * self.sw:
+            return None
+        return (self.sw * self.sty - self.st * self.sy) / denominator
+
+
+class BatteryHealth:
+    """Battery health indicators of one UPS.
+
+    - Energy estimate: remaining runtime times output power while on mains
+      with a full battery, in Wh. The UPS derives runtime from the state of
+      its battery, so this drifts down as the battery ages.
+    - Energy trend: change of the energy estimate in percent per 30 days.
+    - Voltage under load: battery voltage while running on battery.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the tracker."""
+        self._store = entry_store(hass, entry, STORE_BATTERY_HEALTH)
+        self.energy = DecayingStats(half_life=7 * DAY)
+        self.energy_trend = DecayingTrend(half_life=90 * DAY)
+        self.voltage_under_load = DecayingStats(half_life=30 * DAY)
+        self.temperature = DecayingStats(half_life=7 * DAY)
+        self.tests_passed = 0
+        self.tests_failed = 0
+        self._last_test_result: int | None = None
+        self._saved_at = 0.0
+
+    async def async_load(self) -> None:
+        """Restore the stored statistics."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        for name in ("energy", "voltage_under_load", "temperature"):
+            if name in stored:
+                setattr(self, name, DecayingStats(**stored[name]))
+        if "energy_trend" in stored:
+            self.energy_trend = DecayingTrend(**stored["energy_trend"])
+        self.tests_passed = stored.get("tests_passed", 0)
+        self.tests_failed = stored.get("tests_failed", 0)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the state to store."""
+        return {
+            "energy": asdict(self.energy),
+            "energy_trend": asdict(self.energy_trend),
+            "voltage_under_load": asdict(self.voltage_under_load),
+            "temperature": asdict(self.temperature),
+            "tests_passed": self.tests_passed,
+            "tests_failed": self.tests_failed,
+        }
+
+    @callback
+    def async_update(self, data: dict[str, Any], timestamp: float) -> None:
+        """Feed one fresh poll into the statistics."""
+        mode = data.get("operating_mode")
+        charge = data.get("battery_charge")
+        runtime = data.get("runtime_remaining")
+        power = data.get("active_power_total")
+
+        if mode is not None and mode not in _ON_BATTERY:
+            if charge is not None and charge >= 95 and runtime and power:
+                energy = runtime * power / 60.0
+                self.energy.add(timestamp, energy)
+                self.energy_trend.add(timestamp, energy)
+        elif mode in _ON_BATTERY and (voltage := data.get("battery_voltage")):
+            self.voltage_under_load.add(timestamp, voltage)
+
+        if (temperature := data.get("temperature")) is not None:
+            self.temperature.add(timestamp, temperature)
+
+        # Count a test once, when a running test turns into its result; a
+        # poll without the status block does not reset what was last seen
+        if (result := data.get("test_result")) is not None:
+            if self._last_test_result == BatteryTestResult.IN_PROGRESS:
+                if result == BatteryTestResult.PASSED:
+                    self.tests_passed += 1
+                elif result == BatteryTestResult.FAILED:
+                    self.tests_failed += 1
+            self._last_test_result = result
+
+        if timestamp - self._saved_at >= BATTERY_HEALTH_SAVE_INTERVAL:
+            self._saved_at = timestamp
+            self._store.async_delay_save(self._data_to_save)
+
+    def indicators(self) -> dict[str, Any]:
+        """Return the health indicators as coordinator values."""
+        energy = self.energy.value
+        slope = self.energy_trend.slope
+        return {
+            "battery_energy_estimate": None if energy is None else round(energy),
+            "battery_energy_trend": (
+                None
+                if slope is None or not energy
+                else round(slope * 30 / energy * 100, 1)
+            ),
+            "battery_voltage_under_load": (
+                None
+                if (voltage := self.voltage_under_load.value) is None
+                else round(voltage, 1)
+            ),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            **self._data_to_save(),
+            "energy_std": self.energy.std,
+            "temperature_mean": self.temperature.value,
+        }
+
+    async def async_save(self) -> None:
+        """Store the statistics now."""
+        await self._store.async_save(self._data_to_save())
@@ -0,0 +1,199 @@
+"""Battery test recording for Ever Powerline UPS.
+
+While a battery test runs, battery charge, voltage and runtime are sampled
+every second on top of the regular poll, and the discharge curve is stored
+with the test result once the UPS reports the outcome.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BATTERY_TEST_HISTORY,
+    BATTERY_TEST_MAX_DURATION,
+    BATTERY_TEST_RESULT_NAMES,
+    BATTERY_TEST_SAMPLE_INTERVAL,
+    BATTERY_TEST_START,
+    BATTERY_TEST_START_TIMEOUT,
+    DOMAIN,
+    REG_BATTERY_TEST,
+    BatteryTestResult,
+)
+from .scheduler import RequestPriority
+from .storage import STORE_BATTERY_TESTS, entry_store
+
+if TYPE_CHECKING:
+    from .coordinator import EverUPSCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BatteryTestRun:
+    """Samples of the battery test in progress."""
+
+    started: str
+    seen_in_progress: bool = False
+    result: int | None = None
+    # [seconds since start, charge %, voltage V, runtime min]
+    samples: list[list[float | None]] = field(default_factory=list)
+
+
+# Profile fields read for each sample, from the status and measurement blocks
+STATUS_FIELDS: tuple[str, ...] = ("test_result",)
+SAMPLE_FIELDS: tuple[str, ...] = (
+    "runtime_minutes",
+    "runtime_seconds",
+    "battery_charge",
+    "battery_voltage_pos",
+    "battery_voltage_neg",
+)
+
+
+class BatteryTestRecorder:
+    """Sample a running battery test and keep a history of the results."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: EverUPSCoordinator,
+    ) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._entry = entry
+        self._coordinator = coordinator
+        self._store = entry_store(hass, entry, STORE_BATTERY_TESTS)
+        self.history: list[dict[str, Any]] = []
+        self.run: BatteryTestRun | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def async_load(self) -> None:
+        """Load the stored test history."""
+        if (stored := await self._store.async_load()) is not None:
+            self.history = stored.get("tests", [])
+
+    async def async_start(self) -> bool:
+        """Start a battery test on the UPS and sample it."""
+        if self.run is not None:
+            return False
+        if not await self._coordinator.async_write_register(
+            REG_BATTERY_TEST, BATTERY_TEST_START
+        ):
+            return False
+        self._async_begin()
+        return True
+
+    @callback
+    def async_poll_update(self, data: dict[str, Any]) -> None:
+        """Start sampling a test that was started elsewhere, seen by a poll."""
+        if (
+            self.run is None
+            and data.get("test_result") == BatteryTestResult.IN_PROGRESS
+        ):
+            self._async_begin()
+
+    @callback
+    def _async_begin(self) -> None:
+        """Start the sampling task."""
+        self.run = BatteryTestRun(started=dt_util.utcnow().isoformat())
+        self._task = self._entry.async_create_background_task(
+            self._hass,
+            self._async_sample(self.run),
+            name=f"{DOMAIN} battery test {self._coordinator.host}",
+        )
+
+    async def _async_read(
+        self, block: str, keys: tuple[str, ...]
+    ) -> dict[str, Any] | None:
+        """Read profile fields for a sample, None if the read failed."""
+        try:
+            return await self._coordinator.async_read_fields(
+                block, keys, RequestPriority.MEASUREMENT, quiet=True
+            )
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Battery test sample failed: %s", err)
+            return None
+
+    async def _async_sample(self, run: BatteryTestRun) -> None:
+        """Sample until the UPS reports the test result."""
+        loop = self._hass.loop
+        start = loop.time()
+        try:
+            while (elapsed := loop.time() - start) < BATTERY_TEST_MAX_DURATION:
+                status = await self._async_read("status", STATUS_FIELDS)
+                if status is not None:
+                    run.result = status.get("test_result")
+                battery = await self._async_read("measurements", SAMPLE_FIELDS)
+                if battery is not None:
+                    run.samples.append(
+                        [
+                            round(elapsed, 1),
+                            battery.get("battery_charge"),
+                            battery.get("battery_voltage"),
+                            battery.get("runtime_remaining"),
+                        ]
+                    )
+
+                if run.result == BatteryTestResult.IN_PROGRESS:
+                    run.seen_in_progress = True
+                elif run.seen_in_progress or elapsed > BATTERY_TEST_START_TIMEOUT:
+                    break
+                await asyncio.sleep(BATTERY_TEST_SAMPLE_INTERVAL)
+            await self._async_finish(run, loop.time() - start)
+        finally:
+            self.run = None
+            self._task = None
+
+    async def _async_finish(self, run: BatteryTestRun, duration: float) -> None:
+        """Store the result of a finished test."""
+        if not run.seen_in_progress:
+            _LOGGER.warning(
+                "Battery test on %s did not start", self._coordinator.host
+            )
+            return
+
+        result = run.result
+        if result == BatteryTestResult.IN_PROGRESS:
+            result_name = "Timed out"
+        else:
+            result_name = BATTERY_TEST_RESULT_NAMES.get(
+                result, f"Unknown ({result})"
+            )
+        samples = run.samples
+        test = {
+            "started": run.started,
+            "finished": dt_util.utcnow().isoformat(),
+            "duration": round(duration),
+            "result": result_name,
+            "start_charge": samples[0][1] if samples else None,
+            "end_charge": samples[-1][1] if samples else None,
+            "start_voltage": samples[0][2] if samples else None,
+            "min_voltage": min(
+                (sample[2] for sample in samples if sample[2] is not None),
+                default=None,
+            ),
+            "samples": samples,
+        }
+        _LOGGER.info(
+            "Battery test on %s finished: %s after %d s, %d samples",
+            self._coordinator.host,
+            result_name,
+            test["duration"],
+            len(samples),
+        )
+        self.history = [*self.history, test][-BATTERY_TEST_HISTORY:]
+        await self._store.async_save({"tests": self.history})
+
+    async def async_stop(self) -> None:
+        """Stop sampling without storing the running test."""
+        if self._task is not None:
+            self._task.cancel()
@@ -7,6 +7,7 @@ import logging
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -86,9 +87,15 @@ class EverUPSButton(CoordinatorEntity[EverUPSCoordinator], ButtonEntity):
             self.entity_description.register_value,
         )
         
-        success = await self.coordinator.async_write_register(
-            REG_BATTERY_TEST, self.entity_description.register_value
-        )
+        if self.entity_description.register_value == BATTERY_TEST_START:
+            if self.coordinator.battery_test.run is not None:
+                raise HomeAssistantError("A battery test is already running")
+            # Also samples the test at full rate and stores its result
+            success = await self.coordinator.battery_test.async_start()
+        else:
+            success = await self.coordinator.async_write_register(
+                REG_BATTERY_TEST, self.entity_description.register_value
+            )
         
         if success:
             _LOGGER.info(
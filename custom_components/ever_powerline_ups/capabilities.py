@@ -0,0 +1,210 @@
+"""Register capabilities of Ever Powerline UPS models.
+
+Not every model implements every register: single-phase units report
+0xFFFF for the L2/L3 measurements, some have no bypass, and some answer the
+timer block with a Modbus exception. A probe run once per serial number and
+firmware finds out which, and the result is stored with the entry. The poll
+then reads only the part of each block of the register profile that
+carries supported values, and entities of unsupported values are not
+created. The probe_capabilities action discards the result and probes
+again, for a register that only read 0xFFFF while the probe ran.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .decode import PollBlock
+from .profile import RegisterProfile
+from .storage import STORE_CAPABILITIES, entry_store
+
+# Probe reads of the blocks with optional fields, a register must read
+# 0xFFFF in all of them to count as unsupported
+PROBE_READS = 3
+PROBE_SPACING = 1.0  # seconds
+
+# Blocks of the profile, polled or read on demand, that are left out when
+# the UPS answers them with a Modbus exception or the profile has none
+OPTIONAL_BLOCKS: tuple[str, ...] = ("warnings", "timers")
+
+# Coordinator values that only some models have, with the profile fields
+# each one needs. Only these fields are probed, the others are always read.
+OPTIONAL_VALUES: dict[str, tuple[str, ...]] = {
+    "input_voltage_l2": ("input_voltage_l2",),
+    "input_voltage_l3": ("input_voltage_l3",),
+    "output_voltage_l2": ("output_voltage_l2",),
+    "output_voltage_l3": ("output_voltage_l3",),
+    "output_current_l2": ("output_current_l2",),
+    "output_current_l3": ("output_current_l3",),
+    "output_current_imbalance": ("output_current_l2",),
+    "active_power_l2": ("active_power_l2",),
+    "active_power_l3": ("active_power_l3",),
+    "apparent_power_l2": ("apparent_power_l2",),
+    "apparent_power_l3": ("apparent_power_l3",),
+    "power_factor_l2": ("active_power_l2", "apparent_power_l2"),
+    "power_factor_l3": ("active_power_l3", "apparent_power_l3"),
+    "load_l2": ("load_l2",),
+    "load_l3": ("load_l3",),
+    "bypass_voltage": ("bypass_voltage",),
+    "bypass_frequency": ("bypass_frequency",),
+    "bypass_sag_count": ("bypass_voltage",),
+    "bypass_swell_count": ("bypass_voltage",),
+    "bypass_outage_count": ("bypass_voltage",),
+    "bypass_frequency_excursion_count": ("bypass_frequency",),
+}
+OPTIONAL_FIELDS: frozenset[str] = frozenset(
+    field for fields in OPTIONAL_VALUES.values() for field in fields
+)
+# Coordinator values that come from an optional block
+OPTIONAL_BLOCK_VALUES: dict[str, str] = {
+    "active_warnings": "warnings",
+    "active_warning_count": "warnings",
+}
+
+
+@dataclass(slots=True)
+class Capabilities:
+    """What one UPS (serial number and firmware) implements."""
+
+    serial: str = ""
+    firmware: str = ""
+    profile: str = ""
+    probed: bool = False
+    unsupported_blocks: list[str] = field(default_factory=list)
+    unsupported_fields: list[str] = field(default_factory=list)
+    load_segments: int = 0
+
+    def supports(self, value_key: str | None) -> bool:
+        """Return False for a value that needs an unsupported field."""
+        if (block := OPTIONAL_BLOCK_VALUES.get(value_key or "")) is not None:
+            return self.supports_block(block)
+        fields = OPTIONAL_VALUES.get(value_key or "", ())
+        return not any(field in self.unsupported_fields for field in fields)
+
+    def supports_block(self, name: str) -> bool:
+        """Return False for a block the UPS rejected."""
+        return name not in self.unsupported_blocks
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the capabilities to store."""
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class BlockRead:
+    """The registers actually read for a poll block."""
+
+    block: PollBlock
+    address: int
+    count: int
+
+    def expand(self, registers: list[int]) -> list[int]:
+        """Return the full block, unread registers as 0xFFFF."""
+        before = self.address - self.block.address
+        after = self.block.count - before - len(registers)
+        return [0xFFFF] * before + registers + [0xFFFF] * after
+
+
+def profile_capabilities(profile: RegisterProfile) -> Capabilities:
+    """Return the capabilities before a probe: what the profile decodes."""
+    decoded = {key for block in profile.poll_blocks for key, _ in block.fields}
+    return Capabilities(
+        profile=profile.name,
+        unsupported_blocks=[
+            name for name in OPTIONAL_BLOCKS if profile.block(name) is None
+        ],
+        unsupported_fields=sorted(OPTIONAL_FIELDS - decoded),
+    )
+
+
+def probe_blocks(profile: RegisterProfile) -> tuple[PollBlock, ...]:
+    """Return the poll blocks that decode optional fields."""
+    return tuple(
+        block
+        for block in profile.poll_blocks
+        if any(key in OPTIONAL_FIELDS for key, _ in block.fields)
+    )
+
+
+def analyze_block(block: PollBlock, reads: list[list[int]]) -> list[str]:
+    """Return the optional fields of a block that read 0xFFFF every time."""
+    return [
+        key
+        for key, offset in block.fields
+        if key in OPTIONAL_FIELDS and all(read[offset] == 0xFFFF for read in reads)
+    ]
+
+
+def field_read(block: PollBlock, keys: Collection[str]) -> BlockRead | None:
+    """Return the read of the span of a block that carries ``keys``.
+
+    None if the block decodes none of them.
+    """
+    used = sorted(offset for key, offset in block.fields if key in keys)
+    if not used:
+        return None
+    return BlockRead(block, block.address + used[0], used[-1] + 1 - used[0])
+
+
+def read_plan(
+    capabilities: Capabilities, profile: RegisterProfile
+) -> tuple[BlockRead, ...]:
+    """Return the reads of one poll.
+
+    Rejected blocks are skipped and every block is cut down to the span of
+    the supported registers its decoder uses.
+    """
+    plan: list[BlockRead] = []
+    for block in profile.poll_blocks:
+        if not capabilities.supports_block(block.name):
+            continue
+        keys = [
+            key
+            for key, _ in block.fields
+            if key not in capabilities.unsupported_fields
+        ]
+        if (read := field_read(block, keys)) is not None:
+            plan.append(read)
+    return tuple(plan)
+
+
+async def async_load_capabilities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    serial: str,
+    firmware: str,
+    profile: RegisterProfile,
+) -> Capabilities | None:
+    """Return the stored probe result, None if it is for other firmware.
+
+    A result probed with another profile is not used either, its fields
+    may not be the ones the current profile decodes.
+    """
+    stored = await entry_store(hass, entry, STORE_CAPABILITIES).async_load()
+    if (
+        stored is None
+        or stored.get("serial") != serial
+        or stored.get("firmware") != firmware
+        or stored.get("profile") != profile.name
+    ):
+        return None
+    return Capabilities(**stored)
+
+
+async def async_save_capabilities(
+    hass: HomeAssistant, entry: ConfigEntry, capabilities: Capabilities
+) -> None:
+    """Store a probe result."""
+    await entry_store(hass, entry, STORE_CAPABILITIES).async_save(
+        capabilities.as_dict()
+    )
+
+
+async def async_remove_capabilities(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored probe result, so the next setup probes again."""
+    await entry_store(hass, entry, STORE_CAPABILITIES).async_remove()
@@ -0,0 +1,99 @@
+"""Lazy pymodbus access for Ever Powerline UPS.
+
+pymodbus is only imported when the first connection is opened, and then in
+the executor, so loading the integration during startup stays cheap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import socket
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    KEEPALIVE_COUNT,
+    KEEPALIVE_IDLE,
+    KEEPALIVE_INTERVAL,
+    KEEPALIVE_USER_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from pymodbus.client import AsyncModbusTcpClient
+
+_LOGGER = logging.getLogger(__name__)
+
+_IMPORT_LOCK = asyncio.Lock()
+_pymodbus_client: Any = None
+_modbus_exception: type[Exception] | None = None
+
+
+class _NotLoadedError(Exception):
+    """Stand-in for ModbusException before pymodbus is imported."""
+
+
+def _import_pymodbus() -> tuple[Any, type[Exception]]:
+    """Import the pymodbus modules used by the integration (blocking)."""
+    pymodbus = importlib.import_module("pymodbus")
+    # Log pymodbus version for debugging
+    _LOGGER.info("Using pymodbus version: %s", pymodbus.__version__)
+    return (
+        importlib.import_module("pymodbus.client"),
+        importlib.import_module("pymodbus.exceptions").ModbusException,
+    )
+
+
+async def async_create_client(
+    hass: HomeAssistant, host: str, port: int, **kwargs: Any
+) -> AsyncModbusTcpClient:
+    """Create a Modbus TCP client, importing pymodbus on first use."""
+    global _pymodbus_client, _modbus_exception  # noqa: PLW0603
+
+    if _pymodbus_client is None:
+        async with _IMPORT_LOCK:
+            if _pymodbus_client is None:
+                _pymodbus_client, _modbus_exception = (
+                    await hass.async_add_executor_job(_import_pymodbus)
+                )
+    return _pymodbus_client.AsyncModbusTcpClient(host=host, port=port, **kwargs)
+
+
+def configure_keepalive(client: AsyncModbusTcpClient) -> None:
+    """Turn on TCP keepalive with short timers on a connected client.
+
+    A gateway that drops the session without a FIN or RST (NAT and Wi-Fi
+    bridges do) then shows up as a closed connection after a few seconds of
+    silence, and unacknowledged requests abort the connection before the
+    request timeout. Options the platform does not have are skipped.
+    """
+    transport = getattr(getattr(client, "ctx", client), "transport", None)
+    sock = transport.get_extra_info("socket") if transport is not None else None
+    if sock is None:
+        _LOGGER.debug("No socket to enable keepalive on")
+        return
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (
+        ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+        ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+        ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+        ("TCP_USER_TIMEOUT", KEEPALIVE_USER_TIMEOUT * 1000),
+    ):
+        if (option := getattr(socket, name, None)) is not None:
+            options.append((socket.IPPROTO_TCP, option, value))
+    try:
+        for level, option, value in options:
+            sock.setsockopt(level, option, value)
+    except OSError as err:
+        _LOGGER.debug("Could not enable TCP keepalive: %s", err)
+
+
+def modbus_exception() -> type[Exception]:
+    """Return ModbusException for except clauses without importing pymodbus.
+
+    Before the first client is created no Modbus error can be raised, so a
+    stand-in that is never raised is returned instead.
+    """
+    return _modbus_exception or _NotLoadedError
@@ -2,117 +2,359 @@
 
 from __future__ import annotations
 
+import ipaddress
 import logging
 from typing import Any
 
 import voluptuous as vol
-import pymodbus
-from pymodbus.client import AsyncModbusTcpClient
-from pymodbus.exceptions import ModbusException
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    SOURCE_IMPORT,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
 
-from .const import DEFAULT_PORT, DEFAULT_SLAVE_ID, DOMAIN, REG_IDENTIFIERS
+from .alarms import WARNING_BITS
+from .const import (
+    AGGREGATE_WINDOWS,
+    CONF_AGGREGATE_WINDOW,
+    CONF_ALARM_INTERVAL,
+    CONF_DEBOUNCED_WARNINGS,
+    CONF_DEVICES,
+    CONF_FLEET,
+    CONF_IDENTITY,
+    CONF_MAX_STALE_AGE,
+    CONF_NETWORK,
+    CONF_PORTS,
+    CONF_SCAN_INTERVAL,
+    CONF_STALE_TOLERANCE,
+    CONF_STATE_INTERVAL,
+    CONF_STATISTICS_IMPORT,
+    CONF_WARNING_ASSERT_DELAY,
+    CONF_WARNING_CLEAR_DELAY,
+    DEFAULT_AGGREGATE_WINDOW,
+    DEFAULT_ALARM_INTERVAL,
+    DEFAULT_DEBOUNCED_WARNINGS,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_TOLERANCE,
+    DEFAULT_STATE_INTERVAL,
+    DEFAULT_WARNING_ASSERT_DELAY,
+    DEFAULT_WARNING_CLEAR_DELAY,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_MAX_PROBES,
+    DISCOVERY_TIMEOUT,
+    DOMAIN,
+)
+from .device import DeviceIdentity
+from .discovery import DiscoveredUPS, async_probe, async_scan, parse_ports
 
 _LOGGER = logging.getLogger(__name__)
 
-# Log pymodbus version for debugging
-_LOGGER.info("Using pymodbus version: %s", pymodbus.__version__)
-
-STEP_USER_DATA_SCHEMA = vol.Schema(
+STEP_MANUAL_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
         vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
     }
 )
 
+STEP_SCAN_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NETWORK): str,
+        vol.Required(CONF_PORTS, default=str(DEFAULT_PORT)): str,
+    }
+)
+
 
 class EverPowerlineUPSConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Ever Powerline UPS."""
 
     VERSION = 1
 
-    async def _test_connection(
-        self, host: str, port: int
-    ) -> tuple[bool, str | None, str | None]:
-        """Test connection to UPS and return (success, model, serial)."""
-        _LOGGER.debug("Testing connection to %s:%d", host, port)
-        client = AsyncModbusTcpClient(host=host, port=port, timeout=10)
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered: dict[str, DiscoveredUPS] = {}
 
-        try:
-            connected = await client.connect()
-            _LOGGER.debug("Client connected: %s", connected)
-            if not connected:
-                return False, None, None
-
-            # Read identifiers to verify connection
-            _LOGGER.debug("Reading identifiers from register 0x%04X", REG_IDENTIFIERS)
-            result = await client.read_holding_registers(
-                REG_IDENTIFIERS, count=80, device_id=DEFAULT_SLAVE_ID
-            )
-            _LOGGER.debug("Read result: %s", result)
-
-            if result.isError():
-                return False, None, None
-
-            # Decode model and serial
-            regs = result.registers
-
-            def decode_string(registers: list[int], max_chars: int) -> str:
-                chars = []
-                for reg in registers:
-                    high_byte = (reg >> 8) & 0xFF
-                    low_byte = reg & 0xFF
-                    if 0x20 <= high_byte <= 0x7A:
-                        chars.append(chr(high_byte))
-                    if 0x20 <= low_byte <= 0x7A:
-                        chars.append(chr(low_byte))
-                return "".join(chars).strip("\x00").strip()[:max_chars]
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow."""
+        return EverPowerlineUPSOptionsFlow(config_entry)
 
-            model = decode_string(regs[16:48], 63)
-            serial = decode_string(regs[56:64], 15)
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: ConfigEntry) -> bool:
+        """Return whether the entry has options; the site totals have none."""
+        return not config_entry.data.get(CONF_FLEET)
 
-            return True, model, serial
-
-        except ModbusException as err:
-            _LOGGER.error("Modbus error during connection test: %s", err)
-            return False, None, None
+    async def _test_connection(self, host: str, port: int) -> DiscoveredUPS | None:
+        """Test connection to UPS and return what it reported."""
+        _LOGGER.debug("Testing connection to %s:%d", host, port)
+        try:
+            device = await async_probe(self.hass, host, port, timeout=10)
         except Exception as err:
             _LOGGER.error("Error during connection test: %s", err)
-            return False, None, None
-        finally:
-            client.close()
+            return None
+
+        _LOGGER.debug("Probe result: %s", device)
+        return device
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["manual", "scan", "fleet"]
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle manual entry of a single UPS."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            host = user_input[CONF_HOST]
-            port = user_input[CONF_PORT]
+            device = await self._test_connection(
+                user_input[CONF_HOST], user_input[CONF_PORT]
+            )
 
-            success, model, serial = await self._test_connection(host, port)
+            if device is not None:
+                return await self._async_create_device_entry(device)
+            errors["base"] = "cannot_connect"
 
-            if success:
-                # Use serial number as unique ID, fallback to host
-                unique_id = serial or host
-                await self.async_set_unique_id(unique_id)
-                self._abort_if_unique_id_configured()
+        return self.async_show_form(
+            step_id="manual",
+            data_schema=STEP_MANUAL_DATA_SCHEMA,
+            errors=errors,
+        )
 
-                title = f"Ever {model}" if model else f"Ever UPS ({host})"
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Scan a subnet and port range for UPS devices."""
+        errors: dict[str, str] = {}
 
-                return self.async_create_entry(
-                    title=title,
-                    data=user_input,
-                )
+        if user_input is not None:
+            try:
+                network = ipaddress.ip_network(user_input[CONF_NETWORK], strict=False)
+                ports = parse_ports(user_input[CONF_PORTS])
+            except ValueError:
+                errors["base"] = "invalid_network"
             else:
-                errors["base"] = "cannot_connect"
+                # Checked before any host is listed: a large network would
+                # block the event loop just building the list
+                if network.version != 4:
+                    errors["base"] = "ipv6_not_supported"
+                elif network.num_addresses * len(ports) > DISCOVERY_MAX_PROBES:
+                    errors["base"] = "network_too_large"
+                else:
+                    hosts = [str(host) for host in network.hosts()] or [
+                        str(network.network_address)
+                    ]
+                    found = await async_scan(
+                        self.hass,
+                        hosts,
+                        ports,
+                        concurrency=DISCOVERY_CONCURRENCY,
+                        timeout=DISCOVERY_TIMEOUT,
+                    )
+                    configured = self._async_current_ids()
+                    self._discovered = {
+                        f"{device.host}:{device.port}": device
+                        for device in found
+                        if (device.serial or device.host) not in configured
+                    }
+                    if self._discovered:
+                        return await self.async_step_scan_select()
+                    errors["base"] = "no_devices_found"
 
         return self.async_show_form(
-            step_id="user",
-            data_schema=STEP_USER_DATA_SCHEMA,
+            step_id="scan",
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_SCAN_DATA_SCHEMA, user_input
+            ),
             errors=errors,
         )
+
+    async def async_step_scan_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user pick which discovered UPS devices to add."""
+        if user_input is not None and user_input[CONF_DEVICES]:
+            selected = [self._discovered[key] for key in user_input[CONF_DEVICES]]
+            # The first device is created by this flow, the rest get their
+            # own import flows so every UPS ends up as a separate entry
+            for device in selected[1:]:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": SOURCE_IMPORT},
+                        data=_device_data(device),
+                    )
+                )
+            return await self.async_step_import(_device_data(selected[0]))
+
+        options = {
+            key: f"{device.model or 'UPS'} ({device.serial or 'no serial'}) - {key}"
+            for key, device in self._discovered.items()
+        }
+        return self.async_show_form(
+            step_id="scan_select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_DEVICES, default=list(options)
+                    ): cv.multi_select(options),
+                }
+            ),
+            description_placeholders={"count": str(len(options))},
+        )
+
+    async def async_step_fleet(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add a device with the totals of all UPS entries."""
+        if any(entry.data.get(CONF_FLEET) for entry in self._async_current_entries()):
+            return self.async_abort(reason="fleet_configured")
+
+        if user_input is not None:
+            await self.async_set_unique_id(CONF_FLEET)
+            return self.async_create_entry(
+                title="Ever UPS site", data={CONF_FLEET: True}
+            )
+
+        return self.async_show_form(step_id="fleet")
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> ConfigFlowResult:
+        """Create an entry for a UPS found by a network scan."""
+        return await self._async_create_device_entry(
+            DiscoveredUPS(
+                host=import_data[CONF_HOST],
+                port=import_data[CONF_PORT],
+                identity=DeviceIdentity.from_dict(import_data[CONF_IDENTITY]),
+            )
+        )
+
+    async def _async_create_device_entry(
+        self, device: DiscoveredUPS
+    ) -> ConfigFlowResult:
+        """Create the entry for a probed UPS.
+
+        The probed identity and rated data are stored with the entry so the
+        coordinator does not read them from the device again.
+        """
+        # Use serial number as unique ID, fallback to host
+        await self.async_set_unique_id(device.serial or device.host)
+        self._abort_if_unique_id_configured()
+
+        title = f"Ever {device.model}" if device.model else f"Ever UPS ({device.host})"
+        return self.async_create_entry(
+            title=title,
+            data={
+                CONF_HOST: device.host,
+                CONF_PORT: device.port,
+                CONF_IDENTITY: device.identity.as_dict(),
+            },
+        )
+
+
+class EverPowerlineUPSOptionsFlow(OptionsFlow):
+    """Handle options for Ever Powerline UPS."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+                    vol.Required(
+                        CONF_STALE_TOLERANCE,
+                        default=options.get(
+                            CONF_STALE_TOLERANCE, DEFAULT_STALE_TOLERANCE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Required(
+                        CONF_MAX_STALE_AGE,
+                        default=options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_DEBOUNCED_WARNINGS,
+                        default=options.get(
+                            CONF_DEBOUNCED_WARNINGS, DEFAULT_DEBOUNCED_WARNINGS
+                        ),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[bit.key for bit in WARNING_BITS],
+                            multiple=True,
+                            translation_key="warning",
+                        )
+                    ),
+                    vol.Required(
+                        CONF_WARNING_ASSERT_DELAY,
+                        default=options.get(
+                            CONF_WARNING_ASSERT_DELAY, DEFAULT_WARNING_ASSERT_DELAY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_WARNING_CLEAR_DELAY,
+                        default=options.get(
+                            CONF_WARNING_CLEAR_DELAY, DEFAULT_WARNING_CLEAR_DELAY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_ALARM_INTERVAL,
+                        default=options.get(
+                            CONF_ALARM_INTERVAL, DEFAULT_ALARM_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                    vol.Required(
+                        CONF_AGGREGATE_WINDOW,
+                        default=options.get(
+                            CONF_AGGREGATE_WINDOW, DEFAULT_AGGREGATE_WINDOW
+                        ),
+                    ): vol.In(AGGREGATE_WINDOWS),
+                    vol.Required(
+                        CONF_STATISTICS_IMPORT,
+                        default=options.get(CONF_STATISTICS_IMPORT, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_STATE_INTERVAL,
+                        default=options.get(
+                            CONF_STATE_INTERVAL, DEFAULT_STATE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                }
+            ),
+        )
+
+
+def _device_data(device: DiscoveredUPS) -> dict[str, Any]:
+    """Return import flow data for a discovered UPS."""
+    return {
+        CONF_HOST: device.host,
+        CONF_PORT: device.port,
+        CONF_IDENTITY: device.identity.as_dict(),
+    }
@@ -8,6 +8,45 @@ DOMAIN: Final = "ever_powerline_ups"
 DEFAULT_PORT: Final = 502
 DEFAULT_SLAVE_ID: Final = 1
 DEFAULT_SCAN_INTERVAL: Final = 10  # seconds
+DEFAULT_STATE_INTERVAL: Final = 60  # seconds between states with statistics import
+WRITE_COALESCE_DELAY: Final = 0.5  # seconds
+DEFAULT_STALE_TOLERANCE: Final = 3  # consecutive failed polls
+DEFAULT_MAX_STALE_AGE: Final = 60  # seconds
+DEFAULT_DEBOUNCED_WARNINGS: Final = ["overload_warning", "bypass_abnormal"]
+DEFAULT_WARNING_ASSERT_DELAY: Final = 10  # seconds
+DEFAULT_WARNING_CLEAR_DELAY: Final = 30  # seconds
+DEFAULT_ALARM_INTERVAL: Final = 1.0  # seconds, 0 disables the alarm watcher
+ALARM_READ_TIMEOUT: Final = 0.5  # seconds, shortest alarm watcher deadline
+ALARM_DEADLINE_FACTOR: Final = 4  # times the smoothed alarm watcher read time
+REQUEST_TIMEOUT: Final = 10  # seconds, pymodbus request timeout
+REQUEST_DEADLINE: Final = 5.0  # seconds a request may hold the link
+RATED_READ_ATTEMPTS: Final = 3  # failed rated block reads until the next setup
+
+# Half-open connection detection: TCP keepalive on the socket, and one
+# register read ahead of a poll on a link that was quiet for a while
+KEEPALIVE_IDLE: Final = 5  # seconds of silence before the first probe
+KEEPALIVE_INTERVAL: Final = 2  # seconds between probes
+KEEPALIVE_COUNT: Final = 3  # unanswered probes until the connection is dropped
+KEEPALIVE_USER_TIMEOUT: Final = 8  # seconds unacknowledged data is kept
+HEARTBEAT_IDLE: Final = 5.0  # seconds without a response
+HEARTBEAT_LEAD: Final = 2.0  # seconds before the poll
+HEARTBEAT_TIMEOUT: Final = 2.0  # seconds
+AGGREGATE_WINDOWS: Final = [1, 5, 15]  # minutes
+DEFAULT_AGGREGATE_WINDOW: Final = 5  # minutes
+
+# Battery test sampling
+BATTERY_TEST_SAMPLE_INTERVAL: Final = 1.0  # seconds
+BATTERY_TEST_START_TIMEOUT: Final = 30  # seconds until the test must show up
+BATTERY_TEST_MAX_DURATION: Final = 3600  # seconds
+BATTERY_TEST_HISTORY: Final = 10  # tests kept
+
+# Battery health statistics
+BATTERY_HEALTH_SAVE_INTERVAL: Final = 900  # seconds
+
+# Network discovery
+DISCOVERY_CONCURRENCY: Final = 64
+DISCOVERY_TIMEOUT: Final = 1.0  # seconds
+DISCOVERY_MAX_PROBES: Final = 4096
 
 # Modbus register base addresses
 REG_IDENTIFIERS: Final = 0x0000  # Length: 80 words
@@ -207,11 +246,60 @@ ABM_STATUS_NAMES: Final = {
 
 # Platforms
 PLATFORMS: Final = ["sensor", "binary_sensor", "button", "number"]
+FLEET_PLATFORMS: Final = ["sensor", "binary_sensor"]
 
 # Config entry data keys
 CONF_HOST: Final = "host"
 CONF_PORT: Final = "port"
+CONF_NETWORK: Final = "network"
+CONF_PORTS: Final = "ports"
+CONF_DEVICES: Final = "devices"
+CONF_IDENTITY: Final = "identity"
+CONF_FLEET: Final = "fleet"  # set on the site totals entry
+
+# Options
+CONF_STALE_TOLERANCE: Final = "stale_tolerance"
+CONF_MAX_STALE_AGE: Final = "max_stale_age"
+CONF_DEBOUNCED_WARNINGS: Final = "debounced_warnings"
+CONF_WARNING_ASSERT_DELAY: Final = "warning_assert_delay"
+CONF_WARNING_CLEAR_DELAY: Final = "warning_clear_delay"
+CONF_ALARM_INTERVAL: Final = "alarm_interval"
+CONF_AGGREGATE_WINDOW: Final = "aggregate_window"
+CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_STATISTICS_IMPORT: Final = "statistics_import"
+CONF_STATE_INTERVAL: Final = "state_interval"
+
+# Services
+SERVICE_START_RECORDING: Final = "start_recording"
+SERVICE_STOP_RECORDING: Final = "stop_recording"
+SERVICE_REPLAY_RECORDING: Final = "replay_recording"
+SERVICE_START_BATTERY_TEST: Final = "start_battery_test"
+SERVICE_GET_BATTERY_TESTS: Final = "get_battery_tests"
+SERVICE_PROBE_CAPABILITIES: Final = "probe_capabilities"
+
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_FILENAME: Final = "filename"
+ATTR_DURATION: Final = "duration"
+ATTR_SPEED: Final = "speed"
+ATTR_INCLUDE_SAMPLES: Final = "include_samples"
+
+# Events
+EVENT_WARNING: Final = f"{DOMAIN}_warning"
+# Fired instead of EVENT_WARNING for replayed frames, so automations on real
+# warnings do not run
+EVENT_WARNING_REPLAYED: Final = f"{DOMAIN}_warning_replayed"
+
+# Directory (inside the config directory) holding frame recordings
+RECORDINGS_DIR: Final = "ever_powerline_ups/recordings"
+
+# Directory (inside the config directory) holding user register profiles
+PROFILES_DIR: Final = "ever_powerline_ups/profiles"
 
 # Coordinator data keys
 DATA_COORDINATOR: Final = "coordinator"
 DATA_DEVICE_INFO: Final = "device_info"
+
+# hass.data keys
+DATA_SCHEDULERS: Final = "schedulers"
+DATA_FLEET: Final = "fleet"
+DATA_PROFILES: Final = "profiles"
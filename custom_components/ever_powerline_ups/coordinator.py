@@ -3,37 +3,114 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable, Collection
+from dataclasses import dataclass, field
 import logging
-from datetime import timedelta
-from typing import Any
+from datetime import datetime, timedelta
+from pathlib import Path
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from pymodbus.client import AsyncModbusTcpClient
-from pymodbus.exceptions import ModbusException
-
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .aggregates import MeasurementAggregates
+from .alarms import WARNING_REGISTERS, WarningChange, WarningTracker
+from .battery_health import BatteryHealth
+from .battery_testing import BatteryTestRecorder
+from .capabilities import (
+    OPTIONAL_BLOCKS,
+    PROBE_READS,
+    PROBE_SPACING,
+    BlockRead,
+    Capabilities,
+    analyze_block,
+    async_load_capabilities,
+    async_save_capabilities,
+    field_read,
+    probe_blocks,
+    profile_capabilities,
+    read_plan,
+)
+from .client import async_create_client, configure_keepalive, modbus_exception
 from .const import (
+    ALARM_DEADLINE_FACTOR,
+    ALARM_READ_TIMEOUT,
+    CONF_AGGREGATE_WINDOW,
+    CONF_ALARM_INTERVAL,
+    CONF_DEBOUNCED_WARNINGS,
+    CONF_IDENTITY,
+    CONF_MAX_STALE_AGE,
+    CONF_SCAN_INTERVAL,
+    CONF_STALE_TOLERANCE,
+    CONF_STATE_INTERVAL,
+    CONF_STATISTICS_IMPORT,
+    CONF_WARNING_ASSERT_DELAY,
+    CONF_WARNING_CLEAR_DELAY,
+    DEFAULT_AGGREGATE_WINDOW,
+    DEFAULT_ALARM_INTERVAL,
+    DEFAULT_DEBOUNCED_WARNINGS,
+    DEFAULT_MAX_STALE_AGE,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_SLAVE_ID,
+    DEFAULT_STALE_TOLERANCE,
+    DEFAULT_STATE_INTERVAL,
+    DEFAULT_WARNING_ASSERT_DELAY,
+    DEFAULT_WARNING_CLEAR_DELAY,
     DOMAIN,
+    EVENT_WARNING,
+    EVENT_WARNING_REPLAYED,
+    HEARTBEAT_IDLE,
+    HEARTBEAT_LEAD,
+    HEARTBEAT_TIMEOUT,
+    RATED_READ_ATTEMPTS,
     REG_IDENTIFIERS,
-    REG_MEASUREMENTS,
+    REG_LOAD_SEGMENT_SUPPORT,
     REG_RATED,
-    REG_STATUS,
-    REG_WARNINGS,
-    OPERATING_MODE_NAMES,
-    BATTERY_STATUS_NAMES,
-    BATTERY_TEST_RESULT_NAMES,
-    ABM_STATUS_NAMES,
-    OperatingMode,
-    BatteryStatus,
-    BatteryTestResult,
-    ABMStatus,
+    REQUEST_DEADLINE,
+    REQUEST_TIMEOUT,
+    WRITE_COALESCE_DELAY,
 )
+from .decode import headroom
+from .device import DeviceIdentity
+from .frames import Frame, FrameRecorder
+from .power_quality import PowerQuality
+from .profile import RegisterProfile, select_profile
+from .runtime import RuntimePredictor
+from .scheduler import (
+    RequestDeadlineError,
+    RequestPriority,
+    StaleRequestError,
+    async_get_scheduler,
+    poll_phase,
+)
+from .stats_import import StatisticsImporter
+from .write_queue import RegisterWriteQueue
+
+if TYPE_CHECKING:
+    from pymodbus.client import AsyncModbusTcpClient
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True)
+class ReplayState:
+    """Decode state of a replay, kept apart from the live polls."""
+
+    warnings: WarningTracker
+    blocks: dict[str, tuple[dict[str, Any], float]] = field(default_factory=dict)
+    block_failures: dict[str, int] = field(default_factory=dict)
+    polls: int = 0
+    # Snapshot of the last replayed poll
+    data: dict[str, Any] | None = None
+
 
 class EverUPSCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator for Ever Powerline UPS data."""
@@ -41,100 +118,560 @@ class EverUPSCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(
         self,
         hass: HomeAssistant,
-        host: str,
-        port: int,
+        entry: ConfigEntry,
+        profiles: tuple[RegisterProfile, ...],
     ) -> None:
         """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        # Polls are scheduled by the coordinator itself on a fixed phase,
+        # see async_start_polling
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=None)
+        self.entry = entry
+        self.host: str = entry.data[CONF_HOST]
+        self.port: int = entry.data[CONF_PORT]
+        # Options this coordinator was set up with
+        self.options = dict(entry.options)
+        self.poll_interval = timedelta(
+            seconds=self.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self.poll_phase = poll_phase(
+            entry.unique_id or f"{self.host}:{self.port}",
+            self.poll_interval.total_seconds(),
         )
-        self.host = host
-        self.port = port
+        self._unsub_poll: CALLBACK_TYPE | None = None
+        self._unsub_heartbeat: CALLBACK_TYPE | None = None
+        self._polling = False
+        # Loop time of the last response of any kind on the link
+        self._last_exchange = float("-inf")
+        self._alarm_watcher: asyncio.Task[None] | None = None
         self._client: AsyncModbusTcpClient | None = None
-        self._lock = asyncio.Lock()
+        self._scheduler = async_get_scheduler(hass, self.host, self.port)
+        self._write_queue = RegisterWriteQueue(
+            hass,
+            self.async_write_registers,
+            self._async_read_back,
+            WRITE_COALESCE_DELAY,
+        )
+
+        # Device info and rated data, stored with the entry by the config flow
+        # probe; entries created before that read them on the first poll, and
+        # a rated block the probe could not settle is read again
+        self.identity = DeviceIdentity()
+        self._identifiers_fetched = CONF_IDENTITY in entry.data
+        if self._identifiers_fetched:
+            self.identity = DeviceIdentity.from_dict(entry.data[CONF_IDENTITY])
+        self._device_info_fetched = self.identity.rated_settled
+        self._rated_failures = 0
+
+        # Register profile of the model, picked again once the identity is
+        # read; the registers it implements, and the reads of one poll cut
+        # down to them: all the profile decodes until the probe has run
+        self._profiles = profiles
+        self.profile = select_profile(profiles, self.model, self.firmware_version)
+        self.capabilities = profile_capabilities(self.profile)
+        self._read_plan = read_plan(self.capabilities, self.profile)
+
+        # Last good decode and read time of every poll block, served again
+        # while its failures are tolerated
+        self._blocks: dict[str, tuple[dict[str, Any], float]] = {}
+        self._block_failures: dict[str, int] = {}
+
+        # Debounced warning state, for the binary sensors and transition events
+        self.warnings = self._new_warning_tracker()
+
+        # Fast sampling and history of battery tests
+        self.battery_test = BatteryTestRecorder(hass, entry, self)
+        self.battery_health = BatteryHealth(hass, entry)
+        self.runtime_predictor = RuntimePredictor()
+        self.power_quality = PowerQuality(hass, entry)
+        self.aggregates = MeasurementAggregates(
+            self.options.get(CONF_AGGREGATE_WINDOW, DEFAULT_AGGREGATE_WINDOW) * 60
+        )
+
+        # Statistics import mode: samples go to hourly statistics and entity
+        # states are written at most once per state interval
+        self.statistics: StatisticsImporter | None = None
+        if self.options.get(CONF_STATISTICS_IMPORT, False):
+            self.statistics = StatisticsImporter(
+                hass, entry, self.poll_interval.total_seconds()
+            )
+        self._state_interval = self.options.get(
+            CONF_STATE_INTERVAL, DEFAULT_STATE_INTERVAL
+        )
+        self._state_written_at = float("-inf")
+        self._state_written_success = True
+        self._force_state_write = False
+
+        # Raw frame recording and replay
+        self.frame_recorder: FrameRecorder | None = None
+        self._unsub_recording_stop: CALLBACK_TYPE | None = None
+        self._replaying = False
+
+    @property
+    def replaying(self) -> bool:
+        """Return True while a recording is replayed."""
+        return self._replaying
+
+    def _new_warning_tracker(self) -> WarningTracker:
+        """Return a warning tracker set up with the debounce options."""
+        return WarningTracker(
+            debounced=self.options.get(
+                CONF_DEBOUNCED_WARNINGS, DEFAULT_DEBOUNCED_WARNINGS
+            ),
+            assert_delay=self.options.get(
+                CONF_WARNING_ASSERT_DELAY, DEFAULT_WARNING_ASSERT_DELAY
+            ),
+            clear_delay=self.options.get(
+                CONF_WARNING_CLEAR_DELAY, DEFAULT_WARNING_CLEAR_DELAY
+            ),
+        )
 
-        # Device info (fetched once)
-        self.manufacturer: str = "EVER"
-        self.model: str = ""
-        self.firmware_version: str = ""
-        self.serial_number: str = ""
+    @property
+    def manufacturer(self) -> str:
+        """Return the manufacturer."""
+        return self.identity.manufacturer
 
-        # Rated data (fetched once)
-        self.rated_apparent_power: int = 0
-        self.rated_active_power: int = 0
-        self.rated_battery_voltage: float = 0.0
-        self.rated_output_voltage: float = 0.0
-        self.rated_output_frequency: float = 0.0
+    @property
+    def model(self) -> str:
+        """Return the model name."""
+        return self.identity.model
 
-        self._device_info_fetched = False
+    @property
+    def firmware_version(self) -> str:
+        """Return the firmware version."""
+        return self.identity.firmware_version
+
+    @property
+    def serial_number(self) -> str:
+        """Return the serial number."""
+        return self.identity.serial_number
 
     async def _ensure_connected(self) -> AsyncModbusTcpClient:
         """Ensure we have a connected client."""
         if self._client is None or not self._client.connected:
-            self._client = AsyncModbusTcpClient(
-                host=self.host,
-                port=self.port,
-                timeout=10,
+            self._client = await async_create_client(
+                self.hass,
+                self.host,
+                self.port,
+                timeout=REQUEST_TIMEOUT,
             )
             connected = await self._client.connect()
             if not connected:
                 raise UpdateFailed(f"Failed to connect to {self.host}:{self.port}")
+            configure_keepalive(self._client)
         return self._client
 
-    async def async_close(self) -> None:
-        """Close the Modbus connection."""
+    def _reset_client(self) -> None:
+        """Drop the connection so the next request reconnects."""
         if self._client is not None:
             self._client.close()
             self._client = None
 
-    def _decode_string(self, registers: list[int], max_chars: int) -> str:
-        """Decode ASCII string from Modbus registers."""
-        chars = []
-        for reg in registers:
-            high_byte = (reg >> 8) & 0xFF
-            low_byte = reg & 0xFF
-            if 0x20 <= high_byte <= 0x7A:
-                chars.append(chr(high_byte))
-            if 0x20 <= low_byte <= 0x7A:
-                chars.append(chr(low_byte))
-        return "".join(chars).strip("\x00").strip()[:max_chars]
-
-    async def _fetch_device_info(self, client: AsyncModbusTcpClient) -> None:
-        """Fetch device identification (only once)."""
-        if self._device_info_fetched:
+    @callback
+    def async_start_polling(self) -> None:
+        """Start polling on this device's phase of the poll interval.
+
+        Every poll starts at ``poll_phase`` seconds past a multiple of the
+        interval on the event loop clock, so devices keep their distinct
+        offsets however long each poll takes. A poll running over its slot
+        skips to the next one instead of queueing up behind itself.
+        """
+        if self.entry.pref_disable_polling:
+            return
+        self._polling = True
+        self._async_schedule_poll()
+
+        interval = self.options.get(CONF_ALARM_INTERVAL, DEFAULT_ALARM_INTERVAL)
+        if interval > 0 and self.capabilities.supports_block("warnings"):
+            self._alarm_watcher = self.entry.async_create_background_task(
+                self.hass,
+                self._async_watch_alarms(interval),
+                name=f"{DOMAIN} alarm watcher {self.host}",
+            )
+
+    @callback
+    def _async_schedule_poll(self) -> None:
+        """Arm the timer for the next poll slot."""
+        loop = self.hass.loop
+        now = loop.time()
+        interval = self.poll_interval.total_seconds()
+        next_poll = now - (now - self.poll_phase) % interval + interval
+        self._unsub_poll = loop.call_at(next_poll, self._async_handle_poll).cancel
+        # Only a link that can be quiet for HEARTBEAT_IDLE needs the check
+        if interval > HEARTBEAT_IDLE + HEARTBEAT_LEAD:
+            self._unsub_heartbeat = loop.call_at(
+                next_poll - HEARTBEAT_LEAD, self._async_handle_heartbeat
+            ).cancel
+
+    @callback
+    def _async_handle_poll(self) -> None:
+        """Run the poll that is due."""
+        self._unsub_poll = None
+        self.entry.async_create_background_task(
+            self.hass, self._async_poll(), name=f"{DOMAIN} poll {self.host}"
+        )
+
+    @callback
+    def _async_handle_heartbeat(self) -> None:
+        """Check a quiet link ahead of the poll that is due."""
+        self._unsub_heartbeat = None
+        if (
+            self._client is None
+            or self.hass.loop.time() - self._last_exchange < HEARTBEAT_IDLE
+        ):
             return
+        self.entry.async_create_background_task(
+            self.hass, self._async_heartbeat(), name=f"{DOMAIN} heartbeat {self.host}"
+        )
 
+    async def _async_heartbeat(self) -> None:
+        """Read one register and reconnect if the link does not answer.
+
+        A gateway that dropped the session silently would otherwise cost the
+        next poll a full request timeout. The read gives up after
+        HEARTBEAT_TIMEOUT and the connection is replaced right away, so the
+        poll finds a fresh one. Any response, an exception response
+        included, proves the link.
+        """
+
+        async def _check(client: AsyncModbusTcpClient) -> None:
+            try:
+                async with asyncio.timeout(HEARTBEAT_TIMEOUT):
+                    await client.read_holding_registers(
+                        REG_IDENTIFIERS, count=1, device_id=DEFAULT_SLAVE_ID
+                    )
+            except (TimeoutError, modbus_exception()) as err:
+                _LOGGER.debug("Heartbeat to %s failed: %s", self.host, err)
+                # Replaced within the same request, so no other request
+                # can pick up the dead connection in between
+                self._reset_client()
+                await self._ensure_connected()
+
+        try:
+            await self._async_request(
+                RequestPriority.BACKGROUND,
+                _check,
+                key="heartbeat",
+                max_age=HEARTBEAT_LEAD,
+            )
+        except StaleRequestError:
+            pass
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Reconnect to %s failed: %s", self.host, err)
+
+    async def _async_poll(self) -> None:
+        """Refresh the data and schedule the next poll."""
         try:
-            # Read identifiers (0x0000, 80 words)
+            await self.async_refresh()
+        finally:
+            if self._polling:
+                self._async_schedule_poll()
+
+    async def _async_watch_alarms(self, interval: float) -> None:
+        """Read only the warning block between polls.
+
+        The small read runs at alarm priority with a short deadline, so a
+        change of a critical warning (power fail, low battery, going to
+        shut down) is published within about ``interval`` seconds instead
+        of on the next poll. Only a critical change is published from here,
+        other warning changes wait for the poll. The watcher pauses while
+        the link is down and backs off while it cannot connect; the poll
+        reconnects.
+
+        The deadline follows the read times seen on the link, so a slow
+        link is not torn down every second. A read that misses it raises
+        the deadline and doubles the pause before the next read, up to the
+        poll interval, until a read succeeds again.
+        """
+
+        read: BlockRead | None = None
+        latency = 0.0  # smoothed read time
+        delay = interval
+
+        async def _read(client: AsyncModbusTcpClient) -> Any:
+            nonlocal latency
+            started = self.hass.loop.time()
             result = await client.read_holding_registers(
-                REG_IDENTIFIERS, count=80, device_id=DEFAULT_SLAVE_ID
+                read.address, count=read.count, device_id=DEFAULT_SLAVE_ID
+            )
+            elapsed = self.hass.loop.time() - started
+            latency = elapsed if not latency else 0.8 * latency + 0.2 * elapsed
+            return result
+
+        while True:
+            await asyncio.sleep(delay)
+            if self.data is None or not self.last_update_success:
+                continue
+            read = next(
+                (read for read in self._read_plan if read.block.name == "warnings"),
+                None,
+            )
+            if read is None:
+                continue
+            deadline = min(
+                REQUEST_DEADLINE,
+                max(ALARM_READ_TIMEOUT, ALARM_DEADLINE_FACTOR * latency),
             )
+            try:
+                result = await self._async_request(
+                    RequestPriority.ALARM,
+                    _read,
+                    key="alarm_watch",
+                    max_age=delay,
+                    deadline=deadline,
+                )
+            except RequestDeadlineError as err:
+                # The read takes at least this long, allow for it next time
+                latency = max(latency, deadline)
+                delay = min(delay * 2, self.poll_interval.total_seconds())
+                _LOGGER.debug(
+                    "Alarm watcher read failed: %s, next read in %s s", err, delay
+                )
+                continue
+            except (StaleRequestError, TimeoutError, modbus_exception()) as err:
+                _LOGGER.debug("Alarm watcher read failed: %s", err)
+                continue
+            except (UpdateFailed, OSError) as err:
+                # No connection, the poll reconnects; check back less often
+                delay = min(delay * 2, self.poll_interval.total_seconds())
+                _LOGGER.debug(
+                    "Alarm watcher cannot connect: %s, next read in %s s", err, delay
+                )
+                continue
+            delay = interval
             if result.isError():
-                _LOGGER.warning("Failed to read device identifiers")
+                continue
+
+            decoded = read.block.decode(read.expand(result.registers))
+            if self.warnings.critical_changed(decoded):
+                self._async_publish_warnings(decoded)
+
+    @callback
+    def _async_publish_warnings(self, decoded: dict[str, Any]) -> None:
+        """Publish a warning block read outside the poll."""
+        now = self.hass.loop.time()
+        self._blocks["warnings"] = (decoded, now)
+        self._block_failures["warnings"] = 0
+        self._async_fire_warning_changes(self.warnings.update(decoded, now))
+        active = self.warnings.active
+        self._force_state_write = True
+        self.async_set_updated_data(
+            {
+                **self.data,
+                **decoded,
+                "active_warnings": active,
+                "active_warning_count": len(active),
+            }
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the entities, at most once per state interval in import mode.
+
+        With statistics import the samples reach the recorder as hourly
+        statistics, so entity states only need writing every now and then.
+        Failed updates, recoveries and warning changes are written straight
+        away.
+        """
+        if self.statistics is not None:
+            now = self.hass.loop.time()
+            success = self.last_update_success
+            if (
+                success
+                and self._state_written_success
+                and not self._force_state_write
+                and now - self._state_written_at < self._state_interval
+            ):
                 return
+            self._state_written_at = now
+            self._state_written_success = success
+            self._force_state_write = False
+        super().async_update_listeners()
 
-            regs = result.registers
-            self.manufacturer = self._decode_string(regs[0:16], 31) or "EVER"
-            self.model = self._decode_string(regs[16:48], 63)
-            self.firmware_version = self._decode_string(regs[48:56], 15)
-            self.serial_number = self._decode_string(regs[56:64], 15)
+    async def async_close(self) -> None:
+        """Close the Modbus connection."""
+        self._polling = False
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+        if self._alarm_watcher is not None:
+            self._alarm_watcher.cancel()
+            self._alarm_watcher = None
+        await self.battery_test.async_stop()
+        await self.battery_health.async_save()
+        await self.power_quality.async_save()
+        if self.statistics is not None:
+            await self.statistics.async_stop()
+        await self.async_stop_recording()
+        self._write_queue.cancel()
+        self._scheduler.cancel_device(self)
+        self._reset_client()
 
-            # Read rated data (0x00E0, 16 words)
+    async def _async_request(
+        self,
+        priority: RequestPriority,
+        func: Callable[[AsyncModbusTcpClient], Awaitable[_T]],
+        *,
+        key: str | None = None,
+        max_age: float | None = None,
+        deadline: float = REQUEST_DEADLINE,
+    ) -> _T:
+        """Run a request on the shared link once the scheduler allows it.
+
+        The request holds the link for at most ``deadline`` seconds, after
+        that it fails with RequestDeadlineError (a TimeoutError) and the
+        connection is resynchronised.
+        """
+
+        async def _execute() -> _T:
+            client = await self._ensure_connected()
+            result = await func(client)
+            self._last_exchange = self.hass.loop.time()
+            return result
+
+        return await self._scheduler.async_submit(
+            self,
+            priority,
+            _execute,
+            key=key,
+            max_age=max_age,
+            deadline=deadline,
+            on_abort=self._async_resync,
+        )
+
+    @callback
+    def _async_resync(self) -> None:
+        """Drop the connection after a request was abandoned mid-transaction.
+
+        The UPS may still answer the abandoned request, and that late
+        response could be taken for the answer to the next one. A new
+        connection starts with no transaction in flight.
+        """
+        _LOGGER.debug("Resynchronising the connection to %s", self.host)
+        self._reset_client()
+
+    async def _async_poll_read(
+        self, address: int, count: int, priority: RequestPriority
+    ) -> list[int] | None:
+        """Read a register block for the poll, None on an error response.
+
+        A poll read still queued when the next poll is due is stale and
+        gets dropped rather than sent.
+        """
+
+        async def _read(client: AsyncModbusTcpClient) -> list[int] | None:
             result = await client.read_holding_registers(
-                REG_RATED, count=16, device_id=DEFAULT_SLAVE_ID
+                address, count=count, device_id=DEFAULT_SLAVE_ID
             )
-            if not result.isError():
-                regs = result.registers
-                self.rated_apparent_power = regs[1] * 100  # VA
-                self.rated_battery_voltage = regs[2] / 10.0  # V
-                self.rated_output_voltage = regs[4] / 10.0  # V
-                self.rated_output_frequency = regs[5] / 10.0  # Hz
-                self.rated_active_power = regs[6] * 100  # W
+            return None if result.isError() else result.registers
 
-            self._device_info_fetched = True
+        return await self._async_request(
+            priority,
+            _read,
+            key=f"poll_0x{address:04X}",
+            max_age=self.poll_interval.total_seconds(),
+        )
+
+    async def _async_probe_read(self, address: int, count: int) -> list[int] | None:
+        """Read registers for the capability probe, None on an error response."""
+
+        async def _read(client: AsyncModbusTcpClient) -> list[int] | None:
+            result = await client.read_holding_registers(
+                address, count=count, device_id=DEFAULT_SLAVE_ID
+            )
+            return None if result.isError() else result.registers
+
+        return await self._async_request(RequestPriority.BACKGROUND, _read)
+
+    async def async_probe_capabilities(self) -> None:
+        """Load or probe which registers this UPS implements.
+
+        The probe runs once per serial number and firmware and its result
+        is stored with the entry. A probe cut short by a link error is not
+        stored, so it runs again on the next setup.
+        """
+        if not (serial := self.serial_number):
+            return
+        firmware = self.firmware_version
+        capabilities = await async_load_capabilities(
+            self.hass, self.entry, serial, firmware, self.profile
+        )
+        if capabilities is None:
+            try:
+                capabilities = await self._async_probe(serial, firmware)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Capability probe of %s failed: %s", self.host, err)
+                return
+            await async_save_capabilities(self.hass, self.entry, capabilities)
+        self.capabilities = capabilities
+        self._read_plan = read_plan(capabilities, self.profile)
+
+    async def _async_probe(self, serial: str, firmware: str) -> Capabilities:
+        """Probe the optional blocks and fields."""
+        capabilities = profile_capabilities(self.profile)
+        capabilities.serial = serial
+        capabilities.firmware = firmware
+        capabilities.probed = True
+        for name in OPTIONAL_BLOCKS:
+            if (block := self.profile.block(name)) is None:
+                continue
+            if await self._async_probe_read(block.address, block.count) is None:
+                capabilities.unsupported_blocks.append(name)
+
+        # A field counts as unsupported only if it never reads a value
+        reads: dict[str, list[list[int]]] = {}
+        blocks = probe_blocks(self.profile)
+        for attempt in range(PROBE_READS):
+            if attempt:
+                await asyncio.sleep(PROBE_SPACING)
+            for block in blocks:
+                registers = await self._async_probe_read(block.address, block.count)
+                if registers is not None:
+                    reads.setdefault(block.name, []).append(registers)
+        for block in blocks:
+            if block.name in reads:
+                capabilities.unsupported_fields.extend(
+                    analyze_block(block, reads[block.name])
+                )
+        capabilities.unsupported_fields.sort()
+
+        segments = await self._async_probe_read(REG_LOAD_SEGMENT_SUPPORT, 2)
+        if segments is not None and segments[0] == 1:
+            capabilities.load_segments = segments[1]
+
+        _LOGGER.debug("Capabilities of %s: %s", self.host, capabilities)
+        return capabilities
+
+    async def _fetch_device_info(self) -> None:
+        """Fetch the device identification, then settle the rated block.
+
+        The identifiers are read once. The rated block is read until it
+        answers or the UPS rejects it with an exception response, which is
+        stored as unsupported; after RATED_READ_ATTEMPTS failed reads it is
+        left until the next setup instead of costing every poll a read.
+        """
+        if self._device_info_fetched:
+            return
+
+        if not self._identifiers_fetched:
+            try:
+                # Read identifiers (0x0000, 80 words)
+                identifiers = await self._async_poll_read(
+                    REG_IDENTIFIERS, 80, RequestPriority.BACKGROUND
+                )
+            except modbus_exception() as err:
+                _LOGGER.warning("Error fetching device info: %s", err)
+                return
+            if identifiers is None:
+                _LOGGER.warning("Failed to read device identifiers")
+                return
+
+            self.identity = DeviceIdentity.from_identifiers(identifiers)
+            self._identifiers_fetched = True
+            self._async_select_profile()
+            self._async_store_identity()
             _LOGGER.debug(
                 "Device info: %s %s (FW: %s, SN: %s)",
                 self.manufacturer,
@@ -142,248 +679,439 @@ class EverUPSCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 self.firmware_version,
                 self.serial_number,
             )
-        except ModbusException as err:
-            _LOGGER.warning("Error fetching device info: %s", err)
+
+        try:
+            # Read rated data (0x00E0, 16 words)
+            rated = await self._async_poll_read(
+                REG_RATED, 16, RequestPriority.BACKGROUND
+            )
+        except Exception as err:  # noqa: BLE001
+            self._rated_failures += 1
+            if self._rated_failures < RATED_READ_ATTEMPTS:
+                _LOGGER.debug("Could not read rated data: %s", err)
+                return
+            _LOGGER.warning(
+                "Rated data of %s not read after %d attempts, retrying on the "
+                "next setup: %s",
+                self.host,
+                self._rated_failures,
+                err,
+            )
+            self._device_info_fetched = True
+            return
+
+        self.identity.decode_rated(rated)
+        self._device_info_fetched = True
+        self._async_store_identity()
+
+    @callback
+    def _async_store_identity(self) -> None:
+        """Keep the identity with the entry so later setups skip its reads."""
+        self.hass.config_entries.async_update_entry(
+            self.entry,
+            data={**self.entry.data, CONF_IDENTITY: self.identity.as_dict()},
+        )
+
+    @callback
+    def _async_select_profile(self) -> None:
+        """Switch to the register profile of the identity just read."""
+        profile = select_profile(self._profiles, self.model, self.firmware_version)
+        if profile is self.profile:
+            return
+        _LOGGER.debug("Using register profile %s for %s", profile.name, self.host)
+        self.profile = profile
+        self.capabilities = profile_capabilities(profile)
+        self._read_plan = read_plan(self.capabilities, profile)
+        self._blocks.clear()
+        self._block_failures.clear()
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the UPS."""
-        async with self._lock:
-            try:
-                client = await self._ensure_connected()
+        try:
+            # Fetch device info once
+            await self._fetch_device_info()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Could not fetch device info: %s", err)
 
-                # Fetch device info once
-                await self._fetch_device_info(client)
+        results: dict[str, list[int] | None] = {}
+        read_times: dict[str, float] = {}
+        error: str | None = None
+        link_error = False
 
-                data: dict[str, Any] = {}
+        for read in self._read_plan:
+            block = read.block
+            registers: list[int] | None = None
+            # After a transport error the remaining blocks are not tried, so
+            # a dead link costs one timeout per poll rather than one per block
+            if not link_error:
+                try:
+                    registers = await self._async_poll_read(
+                        read.address, read.count, block.priority
+                    )
+                except StaleRequestError as err:
+                    error = str(err)
+                except modbus_exception() as err:
+                    error = f"Modbus error: {err}"
+                    link_error = True
+                except Exception as err:  # noqa: BLE001
+                    error = f"Error communicating with UPS: {err}"
+                    link_error = True
+                else:
+                    if registers is None:
+                        error = f"Failed to read {block.name} registers"
+                    else:
+                        read_times[block.name] = self.hass.loop.time()
+                        registers = read.expand(registers)
+                        if self.frame_recorder is not None:
+                            self.frame_recorder.record(block.address, registers)
+            results[block.name] = registers
 
-                # Read warnings (0x0060, 6 words)
-                result = await client.read_holding_registers(
-                    REG_WARNINGS, count=6, device_id=DEFAULT_SLAVE_ID
-                )
-                if result.isError():
-                    raise UpdateFailed("Failed to read warning registers")
+        if link_error:
+            self._reset_client()
 
-                warnings = result.registers
-                data["warnings_0"] = warnings[0]
-                data["warnings_1"] = warnings[1]
-                data["warnings_2"] = warnings[2]
+        data = self._process_blocks(
+            results, self.hass.loop.time(), error, read_times
+        )
+        self.battery_test.async_poll_update(data)
+        # Values kept from earlier polls were already counted
+        if not data["stale"]:
+            timestamp = time.time()
+            self.battery_health.async_update(data, timestamp)
+            self.runtime_predictor.update(data, timestamp)
+            self.power_quality.async_update(
+                data,
+                timestamp,
+                self.identity.rated_output_voltage,
+                self.identity.rated_output_frequency,
+            )
+            self.aggregates.add(data, self.hass.loop.time())
+            if self.statistics is not None:
+                self.statistics.async_add(data, timestamp)
+        data.update(self.battery_health.indicators())
+        data.update(self.runtime_predictor.prediction())
+        data.update(self.power_quality.values())
+        data.update(self.aggregates.values)
+        return data
 
-                # Read status (0x0070, 10 words)
-                result = await client.read_holding_registers(
-                    REG_STATUS, count=10, device_id=DEFAULT_SLAVE_ID
-                )
-                if result.isError():
-                    raise UpdateFailed("Failed to read status registers")
-
-                status = result.registers
-                ups_type = (status[0] >> 8) & 0xFF
-                operating_mode = status[0] & 0xFF
-                input_phases = (status[1] >> 8) & 0xFF
-                output_phases = status[1] & 0xFF
-                battery_status = (status[2] >> 8) & 0xFF
-                test_result = status[2] & 0xFF
-                input_source = (status[3] >> 8) & 0xFF
-                bypass_phases = status[3] & 0xFF
-                abm_status = status[4] & 0xFF
-
-                data["ups_type"] = ups_type
-                data["operating_mode"] = operating_mode
-                data["operating_mode_name"] = OPERATING_MODE_NAMES.get(
-                    operating_mode, f"Unknown ({operating_mode})"
-                )
-                data["input_phases"] = input_phases
-                data["output_phases"] = output_phases
-                data["battery_status"] = battery_status
-                data["battery_status_name"] = BATTERY_STATUS_NAMES.get(
-                    battery_status, f"Unknown ({battery_status})"
-                )
-                data["test_result"] = test_result
-                data["test_result_name"] = BATTERY_TEST_RESULT_NAMES.get(
-                    test_result, f"Unknown ({test_result})"
-                )
-                data["input_source"] = input_source
-                data["bypass_phases"] = bypass_phases
-                data["abm_status"] = abm_status
-                data["abm_status_name"] = ABM_STATUS_NAMES.get(
-                    abm_status, f"Unknown ({abm_status})"
-                )
+    def _process_blocks(
+        self,
+        results: dict[str, list[int] | None],
+        now: float,
+        error: str | None,
+        read_times: dict[str, float] | None = None,
+        replay: ReplayState | None = None,
+    ) -> dict[str, Any]:
+        """Decode the block reads of one poll into a snapshot.
 
-                # Read measurements (0x0080, 80 words)
-                result = await client.read_holding_registers(
-                    REG_MEASUREMENTS, count=80, device_id=DEFAULT_SLAVE_ID
-                )
-                if result.isError():
-                    raise UpdateFailed("Failed to read measurement registers")
-
-                meas = result.registers
-
-                # Helper function to handle 0xFFFF as unavailable
-                def val_or_none(value: int) -> int | None:
-                    """Return None if value is 0xFFFF (unavailable), otherwise return value."""
-                    return None if value == 0xFFFF else value
-
-                def scaled_or_none(value: int, scale: float) -> float | None:
-                    """Return scaled value or None if 0xFFFF."""
-                    return None if value == 0xFFFF else value / scale
-
-                def multiplied_or_none(value: int, multiplier: int) -> int | None:
-                    """Return multiplied value or None if 0xFFFF."""
-                    return None if value == 0xFFFF else value * multiplier
-
-                # Temperature and frequency (should always be available)
-                data["temperature"] = scaled_or_none(meas[0], 10.0)
-                data["input_frequency"] = scaled_or_none(meas[1], 10.0)
-
-                # Input voltage per phase (L2, L3 may be unavailable for single-phase)
-                data["input_voltage_l1"] = scaled_or_none(meas[4], 10.0)
-                data["input_voltage_l2"] = scaled_or_none(meas[5], 10.0)
-                data["input_voltage_l3"] = scaled_or_none(meas[6], 10.0)
-
-                # Output voltage per phase
-                data["output_voltage_l1"] = scaled_or_none(meas[19], 10.0)
-                data["output_voltage_l2"] = scaled_or_none(meas[20], 10.0)
-                data["output_voltage_l3"] = scaled_or_none(meas[21], 10.0)
-
-                # Output current per phase
-                data["output_current_l1"] = scaled_or_none(meas[25], 10.0)
-                data["output_current_l2"] = scaled_or_none(meas[26], 10.0)
-                data["output_current_l3"] = scaled_or_none(meas[27], 10.0)
-
-                # Active power per phase (unit: 100W)
-                data["active_power_l1"] = multiplied_or_none(meas[28], 100)
-                data["active_power_l2"] = multiplied_or_none(meas[29], 100)
-                data["active_power_l3"] = multiplied_or_none(meas[30], 100)
-
-                # Apparent power per phase (unit: 100VA)
-                data["apparent_power_l1"] = multiplied_or_none(meas[31], 100)
-                data["apparent_power_l2"] = multiplied_or_none(meas[32], 100)
-                data["apparent_power_l3"] = multiplied_or_none(meas[33], 100)
-
-                # Load percentage per phase
-                data["load_l1"] = val_or_none(meas[34])
-                data["load_l2"] = val_or_none(meas[35])
-                data["load_l3"] = val_or_none(meas[36])
-
-                # Runtime
-                runtime_min = val_or_none(meas[37])
-                runtime_sec = val_or_none(meas[38])
-                data["runtime_minutes"] = runtime_min
-                data["runtime_seconds"] = runtime_sec
-                if runtime_min is not None and runtime_sec is not None:
-                    data["runtime_remaining"] = runtime_min + (runtime_sec / 60.0)
-                else:
-                    data["runtime_remaining"] = None
-
-                # Battery
-                data["battery_charge"] = val_or_none(meas[41])
-                batt_pos = meas[42]
-                batt_neg = meas[43]
-                data["battery_voltage_pos"] = scaled_or_none(batt_pos, 10.0)
-                data["battery_voltage_neg"] = scaled_or_none(batt_neg, 10.0)
-                if batt_pos != 0xFFFF and batt_neg != 0xFFFF:
-                    data["battery_voltage"] = (batt_pos + batt_neg) / 10.0
-                else:
-                    data["battery_voltage"] = None
-
-                # Bypass
-                data["bypass_frequency"] = scaled_or_none(meas[45], 10.0)
-                data["bypass_voltage"] = scaled_or_none(meas[48], 10.0)
-
-                # Calculate totals from valid phases only
-                def sum_valid(values: list) -> int | None:
-                    """Sum non-None values, return None if all are None."""
-                    valid = [v for v in values if v is not None]
-                    return sum(valid) if valid else None
-
-                def max_valid(values: list) -> int | None:
-                    """Max of non-None values, return None if all are None."""
-                    valid = [v for v in values if v is not None]
-                    return max(valid) if valid else None
-
-                data["active_power_total"] = sum_valid(
-                    [
-                        data["active_power_l1"],
-                        data["active_power_l2"],
-                        data["active_power_l3"],
-                    ]
-                )
-                data["apparent_power_total"] = sum_valid(
-                    [
-                        data["apparent_power_l1"],
-                        data["apparent_power_l2"],
-                        data["apparent_power_l3"],
-                    ]
-                )
-                data["load_total"] = max_valid(
-                    [
-                        data["load_l1"],
-                        data["load_l2"],
-                        data["load_l3"],
-                    ]
-                )
+        Each register block is tracked on its own. A block that fails to read
+        is served from its last good read, marked stale, until the configured
+        number of consecutive failures or the maximum age is exceeded; after
+        that its values are left out so only the entities that depend on it
+        become unavailable. The poll fails as a whole only when no block has
+        any data to serve.
+
+        ``read_times`` holds when each block was read, the end of the poll
+        if left out. A block published in between (the alarm watcher's
+        warning reads) is newer than the poll's own read, and is kept.
+
+        With ``replay`` the kept blocks and warnings are those of the replay,
+        the live state is not touched.
+        """
+        if replay is None:
+            blocks, failures = self._blocks, self._block_failures
+            warnings = self.warnings
+        else:
+            blocks, failures = replay.blocks, replay.block_failures
+            warnings = replay.warnings
+        tolerance = self.options.get(CONF_STALE_TOLERANCE, DEFAULT_STALE_TOLERANCE)
+        max_age = self.options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE)
+        oldest = now
+        data: dict[str, Any] = {}
+
+        for read in self._read_plan:
+            block = read.block
+            if (registers := results.get(block.name)) is not None:
+                read_at = (read_times or {}).get(block.name, now)
+                failures[block.name] = 0
+                last = blocks.get(block.name)
+                if last is not None and last[1] > read_at:
+                    data.update(last[0])
+                    continue
+                decoded = block.decode(registers)
+                blocks[block.name] = (decoded, read_at)
+                data.update(decoded)
+                if block.name == "warnings":
+                    self._async_fire_warning_changes(
+                        warnings.update(decoded, read_at), replayed=replay is not None
+                    )
+                continue
+
+            failed = failures.get(block.name, 0) + 1
+            failures[block.name] = failed
+            if (last := blocks.get(block.name)) is None:
+                continue
+            decoded, read_at = last
+            if failed <= tolerance and now - read_at <= max_age:
+                data.update(decoded)
+                oldest = min(oldest, read_at)
+
+        if not data:
+            raise UpdateFailed(error or "No data received from UPS")
+        if error is not None:
+            _LOGGER.debug("Partial poll: %s", error)
+
+        if "active_power_total" in data:
+            data["active_power_headroom"] = headroom(
+                data["active_power_total"], self.identity.rated_active_power
+            )
+            data["apparent_power_headroom"] = headroom(
+                data["apparent_power_total"], self.identity.rated_apparent_power
+            )
+        if WARNING_REGISTERS[0] in data:
+            data["active_warnings"] = warnings.active
+            data["active_warning_count"] = len(data["active_warnings"])
+        data["stale"] = oldest < now
+        data["data_age"] = round(now - oldest)
+        return data
+
+    @callback
+    def _async_fire_warning_changes(
+        self, changes: list[WarningChange], *, replayed: bool = False
+    ) -> None:
+        """Fire one event per warning that was raised or cleared.
 
-                return data
+        Changes found in a replay go out as EVENT_WARNING_REPLAYED.
+        """
+        if not changes:
+            return
+        if not replayed:
+            self._force_state_write = True
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.serial_number or self.host)}
+        )
+        timestamp = dt_util.utcnow().isoformat()
+        for change in changes:
+            _LOGGER.debug(
+                "Warning %s %s on %s",
+                change.key,
+                "raised" if change.active else "cleared",
+                self.host,
+            )
+            self.hass.bus.async_fire(
+                EVENT_WARNING_REPLAYED if replayed else EVENT_WARNING,
+                {
+                    "config_entry_id": self.entry.entry_id,
+                    "device_id": device.id if device else None,
+                    "serial_number": self.serial_number,
+                    "warning": change.key,
+                    "state": "raised" if change.active else "cleared",
+                    "timestamp": timestamp,
+                },
+            )
+
+    async def async_start_recording(
+        self, path: Path, duration: float | None = None
+    ) -> None:
+        """Start recording the raw register frames of every poll."""
+        await self.async_stop_recording()
+        recorder = FrameRecorder(self.hass, path)
+        await recorder.async_start()
+        self.frame_recorder = recorder
+        if duration:
+            self._unsub_recording_stop = async_call_later(
+                self.hass, duration, self._async_recording_timeout
+            )
+
+    @callback
+    def _async_recording_timeout(self, _now: datetime) -> None:
+        """Stop a recording that reached its duration."""
+        self._unsub_recording_stop = None
+        self.hass.async_create_task(self.async_stop_recording())
+
+    async def async_stop_recording(self) -> FrameRecorder | None:
+        """Stop recording register frames, returning the finished recorder."""
+        if self._unsub_recording_stop is not None:
+            self._unsub_recording_stop()
+            self._unsub_recording_stop = None
+        if (recorder := self.frame_recorder) is not None:
+            self.frame_recorder = None
+            await recorder.async_stop()
+        return recorder
+
+    async def async_replay(self, frames: list[Frame], speed: float) -> ReplayState:
+        """Feed recorded frames through the decode path.
+
+        Frames are grouped into polls (a new poll starts when a block shows
+        up again) and each poll is decoded with a state of its own: the live
+        data, the entities and the fleet never see replayed values, and live
+        polls go on meanwhile. Warning changes are fired as replayed events.
+        The original spacing is kept divided by ``speed``; a speed of 0
+        replays as fast as possible. Only one replay runs at a time.
+        """
+        if self._replaying:
+            raise RuntimeError("A replay is already running")
+        blocks = {block.address: block for block in self.profile.poll_blocks}
+        replay = ReplayState(self._new_warning_tracker())
+        previous: float | None = None
+        results: dict[str, list[int] | None] = {}
+        timestamp = 0.0
+
+        async def _decode() -> None:
+            nonlocal previous
+            if speed > 0 and previous is not None:
+                await asyncio.sleep(max(0.0, timestamp - previous) / speed)
+            previous = timestamp
+            try:
+                replay.data = self._process_blocks(
+                    results, timestamp, None, replay=replay
+                )
+            except UpdateFailed as err:
+                _LOGGER.debug("Replayed poll has no data: %s", err)
+            replay.polls += 1
 
-            except ModbusException as err:
-                self._client = None
-                raise UpdateFailed(f"Modbus error: {err}") from err
-            except Exception as err:
-                self._client = None
-                raise UpdateFailed(f"Error communicating with UPS: {err}") from err
+        self._replaying = True
+        try:
+            for frame in frames:
+                if (block := blocks.get(frame.address)) is None:
+                    continue
+                if block.name in results:
+                    await _decode()
+                    results = {}
+                timestamp = frame.timestamp
+                results[block.name] = list(frame.registers)
+            if results:
+                await _decode()
+        finally:
+            self._replaying = False
+        return replay
 
     async def async_write_register(self, address: int, value: int) -> bool:
         """Write a single register to UPS."""
-        async with self._lock:
-            try:
-                client = await self._ensure_connected()
-                result = await client.write_register(
-                    address, value, device_id=DEFAULT_SLAVE_ID
+
+        async def _write(client: AsyncModbusTcpClient) -> Any:
+            return await client.write_register(
+                address, value, device_id=DEFAULT_SLAVE_ID
+            )
+
+        try:
+            result = await self._async_request(RequestPriority.CONTROL, _write)
+            if result.isError():
+                _LOGGER.error(
+                    "Failed to write register 0x%04X: %s", address, result
                 )
-                if result.isError():
-                    _LOGGER.error(
-                        "Failed to write register 0x%04X: %s", address, result
-                    )
-                    return False
-                return True
-            except ModbusException as err:
-                _LOGGER.error("Modbus error writing register: %s", err)
                 return False
+            return True
+        except (TimeoutError, modbus_exception()) as err:
+            _LOGGER.error("Modbus error writing register: %s", err)
+            return False
 
     async def async_write_registers(self, address: int, values: list[int]) -> bool:
         """Write multiple registers to UPS."""
-        async with self._lock:
-            try:
-                client = await self._ensure_connected()
-                result = await client.write_registers(
-                    address, values, device_id=DEFAULT_SLAVE_ID
+
+        async def _write(client: AsyncModbusTcpClient) -> Any:
+            return await client.write_registers(
+                address, values, device_id=DEFAULT_SLAVE_ID
+            )
+
+        try:
+            result = await self._async_request(RequestPriority.CONTROL, _write)
+            if result.isError():
+                _LOGGER.error(
+                    "Failed to write register 0x%04X: %s", address, result
                 )
-                if result.isError():
-                    _LOGGER.error(
-                        "Failed to write register 0x%04X: %s", address, result
-                    )
-                    return False
-                return True
-            except ModbusException as err:
-                _LOGGER.error("Modbus error writing register: %s", err)
                 return False
+            return True
+        except (TimeoutError, modbus_exception()) as err:
+            _LOGGER.error("Modbus error writing register: %s", err)
+            return False
 
-    async def async_read_registers(self, address: int, count: int) -> list[int] | None:
-        """Read registers from the UPS."""
-        async with self._lock:
-            try:
-                client = await self._ensure_connected()
-                result = await client.read_holding_registers(
-                    address, count=count, device_id=DEFAULT_SLAVE_ID
-                )
-                if result.isError():
-                    _LOGGER.error(
-                        "Failed to read registers 0x%04X: %s", address, result
-                    )
-                    return None
-                return result.registers
-            except ModbusException as err:
-                _LOGGER.error("Modbus error reading registers: %s", err)
+    async def async_read_registers(
+        self,
+        address: int,
+        count: int,
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+        *,
+        quiet: bool = False,
+    ) -> list[int] | None:
+        """Read registers from the UPS.
+
+        A failed read is logged as an error, or only for debugging when
+        ``quiet`` is set for reads that are repeated anyway.
+        """
+        log = _LOGGER.debug if quiet else _LOGGER.error
+
+        async def _read(client: AsyncModbusTcpClient) -> Any:
+            return await client.read_holding_registers(
+                address, count=count, device_id=DEFAULT_SLAVE_ID
+            )
+
+        try:
+            result = await self._async_request(priority, _read)
+            if result.isError():
+                log("Failed to read registers 0x%04X: %s", address, result)
                 return None
+            return result.registers
+        except (TimeoutError, modbus_exception()) as err:
+            log("Modbus error reading registers: %s", err)
+            return None
+
+    async def _async_read_back(self, address: int, count: int) -> list[int] | None:
+        """Read back registers right after a write."""
+        return await self.async_read_registers(
+            address, count, RequestPriority.CONTROL
+        )
+
+    async def async_queue_write_registers(
+        self, address: int, values: list[int]
+    ) -> bool:
+        """Write setpoint registers through the coalescing write queue."""
+        return await self._write_queue.async_write(address, values)
+
+    async def async_read_fields(
+        self,
+        name: str,
+        keys: Collection[str],
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+        *,
+        quiet: bool = False,
+    ) -> dict[str, Any] | None:
+        """Read and decode the registers of a profile block that carry ``keys``.
+
+        None if the profile has no such block or fields, or the read failed.
+        Values of the block outside the read decode as missing.
+        """
+        block = self.profile.block(name)
+        read = None if block is None else field_read(block, keys)
+        if read is None:
+            return None
+        registers = await self.async_read_registers(
+            read.address, read.count, priority, quiet=quiet
+        )
+        if registers is None:
+            return None
+        return read.block.decode(read.expand(registers))
+
+    async def async_read_timers(self) -> bool:
+        """Read the shutdown/startup delay registers in one request."""
+        block = self.profile.block("timers")
+        if block is None or not self.capabilities.supports_block("timers"):
+            return False
+        registers = await self.async_read_registers(
+            block.address, block.count, block.priority
+        )
+        if registers is None:
+            return False
+        self._write_queue.values.update(
+            (block.address + offset, value) for offset, value in enumerate(registers)
+        )
+        return True
+
+    def get_register_pair(self, address: int) -> int | None:
+        """Return the last known 32-bit value of an MSB/LSB register pair."""
+        values = self._write_queue.values
+        if address not in values or address + 1 not in values:
+            return None
+        return (values[address] << 16) | values[address + 1]
 
     @property
     def device_info(self) -> dict[str, Any]:
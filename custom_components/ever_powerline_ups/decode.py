@@ -0,0 +1,146 @@
+"""Register block decoding for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    ABM_STATUS_NAMES,
+    BATTERY_STATUS_NAMES,
+    BATTERY_TEST_RESULT_NAMES,
+    OPERATING_MODE_NAMES,
+)
+from .scheduler import RequestPriority
+
+
+def val_or_none(value: int) -> int | None:
+    """Return None if value is 0xFFFF (unavailable), otherwise return value."""
+    return None if value == 0xFFFF else value
+
+
+def scaled_or_none(value: int, scale: float) -> float | None:
+    """Return scaled value or None if 0xFFFF."""
+    return None if value == 0xFFFF else value / scale
+
+
+def multiplied_or_none(value: int, multiplier: int) -> int | None:
+    """Return multiplied value or None if 0xFFFF."""
+    return None if value == 0xFFFF else value * multiplier
+
+
+def sum_valid(values: list) -> int | None:
+    """Sum non-None values, return None if all are None."""
+    valid = [v for v in values if v is not None]
+    return sum(valid) if valid else None
+
+
+def max_valid(values: list) -> int | None:
+    """Max of non-None values, return None if all are None."""
+    valid = [v for v in values if v is not None]
+    return max(valid) if valid else None
+
+
+def power_factor(active: int | None, apparent: int | None) -> float | None:
+    """Return active over apparent power, None without apparent power.
+
+    Both powers come in 100 W/VA steps, so the ratio is capped at 1.
+    """
+    if active is None or not apparent:
+        return None
+    return round(min(1.0, active / apparent), 2)
+
+
+def imbalance(values: list) -> float | None:
+    """Return the largest deviation from the mean in % of the mean.
+
+    None with fewer than two valid phases or a zero mean.
+    """
+    valid = [v for v in values if v is not None]
+    if len(valid) < 2 or (mean := sum(valid) / len(valid)) <= 0:
+        return None
+    return round(max(abs(v - mean) for v in valid) / mean * 100, 1)
+
+
+def headroom(total: int | None, rated: int) -> int | None:
+    """Return the rated value minus the total, None if either is unknown."""
+    return None if total is None or not rated else rated - total
+
+
+def _named(names: dict[int, str], value: int) -> str:
+    """Return the name of a code, "Unknown (code)" for codes not listed."""
+    return names.get(value, f"Unknown ({value})")
+
+
+def derive_status(data: dict[str, Any]) -> None:
+    """Add the names of the status codes."""
+    if (operating_mode := data.get("operating_mode")) is not None:
+        data["operating_mode_name"] = _named(OPERATING_MODE_NAMES, operating_mode)
+    if (battery_status := data.get("battery_status")) is not None:
+        data["battery_status_name"] = _named(BATTERY_STATUS_NAMES, battery_status)
+    if (test_result := data.get("test_result")) is not None:
+        data["test_result_name"] = _named(BATTERY_TEST_RESULT_NAMES, test_result)
+    if (abm_status := data.get("abm_status")) is not None:
+        data["abm_status_name"] = _named(ABM_STATUS_NAMES, abm_status)
+
+
+def derive_measurements(data: dict[str, Any]) -> None:
+    """Add runtime, battery voltage, totals and per-phase ratios."""
+    phases = ("l1", "l2", "l3")
+
+    runtime_min = data.get("runtime_minutes")
+    runtime_sec = data.get("runtime_seconds")
+    if runtime_min is not None and runtime_sec is not None:
+        data["runtime_remaining"] = runtime_min + (runtime_sec / 60.0)
+    else:
+        data["runtime_remaining"] = None
+
+    batt_pos = data.get("battery_voltage_pos")
+    batt_neg = data.get("battery_voltage_neg")
+    if batt_pos is not None and batt_neg is not None:
+        data["battery_voltage"] = round(batt_pos + batt_neg, 1)
+    else:
+        data["battery_voltage"] = None
+
+    # Calculate totals from valid phases only
+    data["active_power_total"] = sum_valid(
+        [data.get(f"active_power_{phase}") for phase in phases]
+    )
+    data["apparent_power_total"] = sum_valid(
+        [data.get(f"apparent_power_{phase}") for phase in phases]
+    )
+    data["load_total"] = max_valid([data.get(f"load_{phase}") for phase in phases])
+
+    # Derived metrics, computed once here for all phases
+    for phase in phases:
+        data[f"power_factor_{phase}"] = power_factor(
+            data.get(f"active_power_{phase}"), data.get(f"apparent_power_{phase}")
+        )
+    data["power_factor_total"] = power_factor(
+        data["active_power_total"], data["apparent_power_total"]
+    )
+    data["output_current_imbalance"] = imbalance(
+        [data.get(f"output_current_{phase}") for phase in phases]
+    )
+
+
+# Values computed from the decoded registers of a block, referenced by name
+# from the register profiles
+DERIVERS: dict[str, Callable[[dict[str, Any]], None]] = {
+    "status": derive_status,
+    "measurements": derive_measurements,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PollBlock:
+    """A register block of a profile, read on every poll or on demand."""
+
+    name: str
+    address: int
+    count: int
+    priority: RequestPriority
+    decode: Callable[[list[int]], dict[str, Any]]
+    # (value key, offset in the block) of every decoded register
+    fields: tuple[tuple[str, int], ...] = ()
@@ -0,0 +1,86 @@
+"""Device identity decoding for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+
+def decode_string(registers: list[int], max_chars: int) -> str:
+    """Decode ASCII string from Modbus registers."""
+    chars = []
+    for reg in registers:
+        high_byte = (reg >> 8) & 0xFF
+        low_byte = reg & 0xFF
+        if 0x20 <= high_byte <= 0x7A:
+            chars.append(chr(high_byte))
+        if 0x20 <= low_byte <= 0x7A:
+            chars.append(chr(low_byte))
+    return "".join(chars).strip("\x00").strip()[:max_chars]
+
+
+@dataclass(slots=True)
+class DeviceIdentity:
+    """Identification and rated data, read once per device."""
+
+    manufacturer: str = "EVER"
+    model: str = ""
+    firmware_version: str = ""
+    serial_number: str = ""
+    rated_apparent_power: int = 0  # VA
+    rated_active_power: int = 0  # W
+    rated_battery_voltage: float = 0.0  # V
+    rated_output_voltage: float = 0.0  # V
+    rated_output_frequency: float = 0.0  # Hz
+    # False while the rated block has not been read, the rated values are
+    # then zeros and the coordinator reads the block again
+    rated_read: bool = False
+    # The UPS answered the rated block with an exception response, it is
+    # not read again
+    rated_unsupported: bool = False
+
+    @classmethod
+    def from_registers(
+        cls, identifiers: list[int], rated: list[int] | None
+    ) -> DeviceIdentity:
+        """Decode the identifier block (0x0000) and rated block (0x00E0)."""
+        identity = cls.from_identifiers(identifiers)
+        identity.decode_rated(rated)
+        return identity
+
+    @classmethod
+    def from_identifiers(cls, identifiers: list[int]) -> DeviceIdentity:
+        """Decode the identifier block (0x0000), the rated block still unread."""
+        return cls(
+            manufacturer=decode_string(identifiers[0:16], 31) or "EVER",
+            model=decode_string(identifiers[16:48], 63),
+            firmware_version=decode_string(identifiers[48:56], 15),
+            serial_number=decode_string(identifiers[56:64], 15),
+        )
+
+    def decode_rated(self, rated: list[int] | None) -> None:
+        """Decode the rated block (0x00E0), None for an exception response."""
+        if rated is None:
+            self.rated_unsupported = True
+            return
+        self.rated_read = True
+        self.rated_apparent_power = rated[1] * 100
+        self.rated_battery_voltage = rated[2] / 10.0
+        self.rated_output_voltage = rated[4] / 10.0
+        self.rated_output_frequency = rated[5] / 10.0
+        self.rated_active_power = rated[6] * 100
+
+    @property
+    def rated_settled(self) -> bool:
+        """Return True once the rated block needs no further reads."""
+        return self.rated_read or self.rated_unsupported
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeviceIdentity:
+        """Restore an identity stored in a config entry."""
+        names = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the identity as config entry data."""
+        return asdict(self)
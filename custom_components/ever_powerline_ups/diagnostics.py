@@ -0,0 +1,41 @@
+"""Diagnostics support for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .coordinator import EverUPSCoordinator
+from .fleet import FleetCoordinator
+
+TO_REDACT = {CONF_HOST, "serial_number", "serial"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    if isinstance(entry.runtime_data, FleetCoordinator):
+        return {"data": entry.runtime_data.data}
+
+    coordinator: EverUPSCoordinator = entry.runtime_data
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "identity": async_redact_data(coordinator.identity.as_dict(), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "data": coordinator.data,
+        "warnings": coordinator.warnings.as_dict(),
+        "battery_health": coordinator.battery_health.as_dict(),
+        "power_quality": coordinator.power_quality.as_dict(),
+        "profile": coordinator.profile.as_dict(),
+        "capabilities": async_redact_data(
+            coordinator.capabilities.as_dict(), TO_REDACT
+        ),
+    }
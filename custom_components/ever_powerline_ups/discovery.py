@@ -0,0 +1,121 @@
+"""Network discovery of Ever Powerline UPS devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from .client import async_create_client, modbus_exception
+from .const import DEFAULT_SLAVE_ID, REG_IDENTIFIERS, REG_RATED
+from .device import DeviceIdentity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredUPS:
+    """A UPS answering the EVER identifier block."""
+
+    host: str
+    port: int
+    identity: DeviceIdentity
+
+    @property
+    def model(self) -> str:
+        """Return the model name."""
+        return self.identity.model
+
+    @property
+    def serial(self) -> str:
+        """Return the serial number."""
+        return self.identity.serial_number
+
+
+def parse_ports(value: str) -> list[int]:
+    """Parse a port list such as ``502`` or ``502,5020-5023``."""
+    ports: set[int] = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        start = int(first)
+        end = int(last) if last else start
+        if not 0 < start <= end <= 65535:
+            raise ValueError(f"Invalid port range: {part}")
+        ports.update(range(start, end + 1))
+    if not ports:
+        raise ValueError("No ports given")
+    return sorted(ports)
+
+
+async def async_probe(
+    hass: HomeAssistant, host: str, port: int, timeout: float
+) -> DiscoveredUPS | None:
+    """Read the identifier block of one address, None if nothing answers."""
+    client = await async_create_client(
+        hass, host, port, timeout=timeout, retries=0
+    )
+
+    try:
+        if not await client.connect():
+            return None
+
+        result = await client.read_holding_registers(
+            REG_IDENTIFIERS, count=80, device_id=DEFAULT_SLAVE_ID
+        )
+        if result.isError():
+            return None
+
+        identifiers = result.registers
+
+        # Rated data rides on the same connection so the coordinator does not
+        # have to read either block again after the entry is created; an
+        # exception response marks it unsupported in the identity
+        result = await client.read_holding_registers(
+            REG_RATED, count=16, device_id=DEFAULT_SLAVE_ID
+        )
+        rated = None if result.isError() else result.registers
+
+        return DiscoveredUPS(
+            host=host,
+            port=port,
+            identity=DeviceIdentity.from_registers(identifiers, rated),
+        )
+    except (modbus_exception(), OSError, asyncio.TimeoutError) as err:
+        _LOGGER.debug("No UPS at %s:%d: %s", host, port, err)
+        return None
+    finally:
+        client.close()
+
+
+async def async_scan(
+    hass: HomeAssistant,
+    hosts: Iterable[str],
+    ports: Iterable[int],
+    *,
+    concurrency: int,
+    timeout: float,
+) -> list[DiscoveredUPS]:
+    """Probe every host/port pair with at most ``concurrency`` probes in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(host: str, port: int) -> DiscoveredUPS | None:
+        async with semaphore:
+            try:
+                async with asyncio.timeout(timeout * 2):
+                    return await async_probe(hass, host, port, timeout)
+            except asyncio.TimeoutError:
+                return None
+
+    port_list = list(ports)
+    results = await asyncio.gather(
+        *(_probe(host, port) for host in hosts for port in port_list)
+    )
+    found = [result for result in results if result is not None]
+    _LOGGER.debug("Network scan found %d UPS", len(found))
+    return found
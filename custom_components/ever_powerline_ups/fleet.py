@@ -0,0 +1,172 @@
+"""Site totals across all Ever Powerline UPS entries.
+
+The fleet coordinator listens to every UPS coordinator and keeps the site
+totals up to date by applying the change of the one UPS that updated:
+the total power is adjusted by that UPS's difference, the power fail and
+online counts by one at most, and the lowest runtime comes from a heap
+whose outdated entries are dropped when they reach the top. An update of
+one UPS therefore never walks the whole fleet.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+import heapq
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DOMAIN
+from .coordinator import EverUPSCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class FleetMember:
+    """The contribution of one UPS to the site totals."""
+
+    coordinator: EverUPSCoordinator
+    unsub: CALLBACK_TYPE
+    online: bool = False
+    power: float = 0.0
+    power_fail: bool = False
+    runtime: float | None = None
+
+
+class FleetCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Incrementally maintained totals of all UPS entries."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the fleet coordinator."""
+        super().__init__(
+            hass, _LOGGER, name=f"{DOMAIN} fleet", update_interval=None
+        )
+        self.entry = entry
+        self._members: dict[str, FleetMember] = {}
+        self._online = 0
+        self._power = 0.0
+        self._power_fail = 0
+        # (runtime, entry id) of every runtime reported, outdated ones included
+        self._runtimes: list[tuple[float, str]] = []
+        self.data = self._values()
+
+    @callback
+    def async_add_device(self, coordinator: EverUPSCoordinator) -> None:
+        """Start following a UPS."""
+        entry_id = coordinator.entry.entry_id
+        if entry_id in self._members:
+            return
+        self._members[entry_id] = FleetMember(
+            coordinator,
+            coordinator.async_add_listener(
+                partial(self._async_member_updated, entry_id)
+            ),
+        )
+        self._async_member_updated(entry_id)
+
+    @callback
+    def async_remove_device(self, entry_id: str) -> None:
+        """Stop following a UPS and take it out of the totals."""
+        if (member := self._members.pop(entry_id, None)) is None:
+            return
+        member.unsub()
+        self._apply(member, online=False, power=0.0, power_fail=False, runtime=None)
+        self.async_set_updated_data(self._values())
+
+    @callback
+    def _async_member_updated(self, entry_id: str) -> None:
+        """Apply the change of one UPS to the totals."""
+        member = self._members[entry_id]
+        coordinator = member.coordinator
+        data = coordinator.data or {}
+        online = coordinator.last_update_success and bool(data)
+        self._apply(
+            member,
+            online=online,
+            power=(data.get("active_power_total") or 0.0) if online else 0.0,
+            power_fail=online and "power_fail" in data.get("active_warnings", ()),
+            runtime=data.get("runtime_remaining") if online else None,
+        )
+        self.async_set_updated_data(self._values())
+
+    def _apply(
+        self,
+        member: FleetMember,
+        *,
+        online: bool,
+        power: float,
+        power_fail: bool,
+        runtime: float | None,
+    ) -> None:
+        """Replace the contribution of a member by its new values."""
+        self._online += online - member.online
+        self._power += power - member.power
+        self._power_fail += power_fail - member.power_fail
+        if runtime is not None and runtime != member.runtime:
+            heapq.heappush(
+                self._runtimes, (runtime, member.coordinator.entry.entry_id)
+            )
+        member.online = online
+        member.power = power
+        member.power_fail = power_fail
+        member.runtime = runtime
+
+        if not self._members:
+            # Start over from zero instead of carrying rounding errors
+            self._power = 0.0
+            self._runtimes.clear()
+        elif len(self._runtimes) > 4 * len(self._members) + 16:
+            self._runtimes = [
+                (m.runtime, entry_id)
+                for entry_id, m in self._members.items()
+                if m.runtime is not None
+            ]
+            heapq.heapify(self._runtimes)
+
+    def _min_runtime(self) -> tuple[float | None, str | None]:
+        """Return the lowest current runtime and the title of its UPS."""
+        runtimes = self._runtimes
+        while runtimes:
+            runtime, entry_id = runtimes[0]
+            member = self._members.get(entry_id)
+            if member is not None and member.runtime == runtime:
+                return runtime, member.coordinator.entry.title
+            heapq.heappop(runtimes)
+        return None, None
+
+    def _values(self) -> dict[str, Any]:
+        """Return the totals as coordinator values."""
+        runtime, runtime_ups = self._min_runtime()
+        return {
+            "ups_count": len(self._members),
+            "ups_online": self._online,
+            "active_power_total": round(self._power),
+            "power_fail": self._power_fail > 0,
+            "power_fail_count": self._power_fail,
+            "runtime_remaining_min": runtime,
+            "runtime_remaining_min_ups": runtime_ups,
+        }
+
+    @callback
+    def async_close(self) -> None:
+        """Stop following all UPS."""
+        for member in self._members.values():
+            member.unsub()
+        self._members.clear()
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device info for the site."""
+        return {
+            "identifiers": {(DOMAIN, self.entry.entry_id)},
+            "name": self.entry.title,
+            "manufacturer": "Ever",
+            "model": "Site totals",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
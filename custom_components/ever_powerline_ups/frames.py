@@ -0,0 +1,112 @@
+"""Raw register frame recording for Ever Powerline UPS.
+
+A recording is a small header followed by one record per register block
+read: wall-clock timestamp, start address, word count and the raw words,
+all little-endian. Recordings can be replayed through the coordinator's
+decode path without a device.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+import struct
+import time
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+FRAME_MAGIC = b"EVUF"
+FRAME_VERSION = 1
+FLUSH_SIZE = 16384  # bytes buffered before writing to disk
+
+_HEADER = struct.Struct("<4sB")
+_RECORD = struct.Struct("<dHB")
+
+
+@dataclass(frozen=True, slots=True)
+class Frame:
+    """Raw words of one register block read."""
+
+    timestamp: float
+    address: int
+    registers: tuple[int, ...]
+
+
+def encode_frame(frame: Frame) -> bytes:
+    """Encode a frame as a record."""
+    count = len(frame.registers)
+    return _RECORD.pack(frame.timestamp, frame.address, count) + struct.pack(
+        f"<{count}H", *frame.registers
+    )
+
+
+def read_frames(path: Path) -> list[Frame]:
+    """Read all frames of a recording (blocking)."""
+    data = path.read_bytes()
+    magic, version = _HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError(f"{path} is not a frame recording")
+
+    frames = []
+    offset = _HEADER.size
+    while offset < len(data):
+        timestamp, address, count = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        registers = struct.unpack_from(f"<{count}H", data, offset)
+        offset += count * 2
+        frames.append(Frame(timestamp, address, registers))
+    return frames
+
+
+class FrameRecorder:
+    """Append register frames to a recording file."""
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self.path = path
+        self.frame_count = 0
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+
+    async def async_start(self) -> None:
+        """Create the recording file."""
+        await self._hass.async_add_executor_job(self._create)
+        _LOGGER.info("Recording register frames to %s", self.path)
+
+    def _create(self) -> None:
+        """Create the file with its header (blocking)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(_HEADER.pack(FRAME_MAGIC, FRAME_VERSION))
+
+    def record(self, address: int, registers: list[int]) -> None:
+        """Buffer one register block read."""
+        self._buffer += encode_frame(Frame(time.time(), address, tuple(registers)))
+        self.frame_count += 1
+        if len(self._buffer) >= FLUSH_SIZE:
+            self._hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Write buffered frames to disk."""
+        async with self._lock:
+            if not self._buffer:
+                return
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            await self._hass.async_add_executor_job(self._append, data)
+
+    def _append(self, data: bytes) -> None:
+        """Append records to the file (blocking)."""
+        with self.path.open("ab") as file:
+            file.write(data)
+
+    async def async_stop(self) -> None:
+        """Write the remaining frames."""
+        await self.async_flush()
+        _LOGGER.info(
+            "Recorded %d register frames to %s", self.frame_count, self.path
+        )
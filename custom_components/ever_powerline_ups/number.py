@@ -70,6 +70,13 @@ async def async_setup_entry(
     """Set up Ever UPS numbers based on a config entry."""
     coordinator: EverUPSCoordinator = entry.runtime_data
 
+    # Models without the timer registers get no delay entities
+    if not coordinator.capabilities.supports_block("timers"):
+        return
+
+    # Read both delays with one request instead of one per entity
+    await coordinator.async_read_timers()
+
     entities = [
         EverUPSNumber(coordinator, description)
         for description in NUMBER_DESCRIPTIONS
@@ -94,29 +101,14 @@ class EverUPSNumber(CoordinatorEntity[EverUPSCoordinator], NumberEntity):
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.serial_number or coordinator.host}_{description.key}"
         self._attr_device_info = coordinator.device_info
-        self._cached_value: float | None = None
 
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        return self._cached_value
-
-    async def async_added_to_hass(self) -> None:
-        """Run when entity is added to Home Assistant."""
-        await super().async_added_to_hass()
-        # Read the initial value from registers
-        await self._async_read_value()
-
-    async def _async_read_value(self) -> None:
-        """Read the current value from the UPS."""
-        registers = await self.coordinator.async_read_registers(
-            self.entity_description.register_address, 2
+        value = self.coordinator.get_register_pair(
+            self.entity_description.register_address
         )
-        if registers is not None:
-            # Combine MSB and LSB into a 32-bit value
-            # Registers are: [MSB_high, MSB_low] stored as two 16-bit words
-            self._cached_value = float((registers[0] << 16) | registers[1])
-            self.async_write_ha_state()
+        return None if value is None else float(value)
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
@@ -134,13 +126,14 @@ class EverUPSNumber(CoordinatorEntity[EverUPSCoordinator], NumberEntity):
             lsb,
         )
         
-        success = await self.coordinator.async_write_registers(
+        # Writes made within a short window are merged and verified together
+        success = await self.coordinator.async_queue_write_registers(
             self.entity_description.register_address, [msb, lsb]
         )
         
+        # Reflect what the device reported on read-back
+        self.async_write_ha_state()
         if success:
-            self._cached_value = value
-            self.async_write_ha_state()
             _LOGGER.info(
                 "Successfully set %s to %d seconds",
                 self.entity_description.key,
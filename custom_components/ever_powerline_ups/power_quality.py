@@ -0,0 +1,240 @@
+"""Power quality analysis for Ever Powerline UPS.
+
+Input and bypass voltage and frequency are checked against the rated output
+voltage and frequency on every fresh poll. Each source keeps one small state
+machine for its voltage and one for its frequency, so the memory per device
+is constant whatever the history. Thresholds follow the usual IEC 61000-4-30
+classes: below 10 % of nominal is an outage, below 90 % a sag, above 110 % a
+swell. A frequency more than 1 % off nominal is an excursion.
+
+Every change of class is counted as a new event when it starts; an event
+ends once the value is back inside the normal band by the hysteresis margin.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .storage import STORE_POWER_QUALITY, entry_store
+
+SOURCES: tuple[str, ...] = ("input", "bypass")
+EVENT_KINDS: tuple[str, ...] = ("sag", "swell", "outage", "frequency_excursion")
+EVENT_NAMES: tuple[str, ...] = tuple(
+    f"{source}_{kind}" for source in SOURCES for kind in EVENT_KINDS
+)
+
+# Fractions of the nominal value
+OUTAGE_LEVEL = 0.10
+SAG_LEVEL = 0.90
+SWELL_LEVEL = 1.10
+FREQUENCY_TOLERANCE = 0.01
+VOLTAGE_HYSTERESIS = 0.02
+FREQUENCY_HYSTERESIS = 0.002
+
+# Seconds before counters are stored after a change
+SAVE_DELAY = 10
+
+
+@dataclass(slots=True)
+class Condition:
+    """The event in progress on one quantity of one source."""
+
+    kind: str | None = None  # None while normal
+    started: float = 0.0
+    extreme: float = 0.0
+
+
+def classify_voltage(
+    low: float, high: float, nominal: float, current: str | None
+) -> str | None:
+    """Return the voltage event class, None for normal."""
+    if low < nominal * OUTAGE_LEVEL:
+        return "outage"
+    if low < nominal * SAG_LEVEL:
+        return "sag"
+    if high > nominal * SWELL_LEVEL:
+        return "swell"
+    # Stay in the event until the value is well inside the band
+    if current in ("sag", "outage"):
+        return current if low < nominal * (SAG_LEVEL + VOLTAGE_HYSTERESIS) else None
+    if current == "swell":
+        return current if high > nominal * (SWELL_LEVEL - VOLTAGE_HYSTERESIS) else None
+    return None
+
+
+def classify_frequency(
+    frequency: float, nominal: float, current: str | None
+) -> str | None:
+    """Return "frequency_excursion" or None for normal."""
+    tolerance = FREQUENCY_TOLERANCE
+    if current is not None:
+        tolerance -= FREQUENCY_HYSTERESIS
+    if abs(frequency - nominal) > nominal * tolerance:
+        return "frequency_excursion"
+    return None
+
+
+class PowerQuality:
+    """Sag, swell, outage and frequency excursion counters of one UPS."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the analyzer."""
+        self._store = entry_store(hass, entry, STORE_POWER_QUALITY)
+        self.counts: dict[str, int] = dict.fromkeys(EVENT_NAMES, 0)
+        self.outage_duration = 0.0  # seconds, input outages
+        self.last_event: dict[str, Any] | None = None
+        self._conditions: dict[str, Condition] = {
+            f"{source}_{quantity}": Condition()
+            for source in SOURCES
+            for quantity in ("voltage", "frequency")
+        }
+
+    async def async_load(self) -> None:
+        """Restore the stored counters."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        for name, count in stored.get("counts", {}).items():
+            if name in self.counts:
+                self.counts[name] = count
+        self.outage_duration = stored.get("outage_duration", 0.0)
+        self.last_event = stored.get("last_event")
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the state to store."""
+        return {
+            "counts": self.counts,
+            "outage_duration": self.outage_duration,
+            "last_event": self.last_event,
+        }
+
+    @callback
+    def async_update(
+        self,
+        data: dict[str, Any],
+        timestamp: float,
+        rated_voltage: float,
+        rated_frequency: float,
+    ) -> None:
+        """Feed one fresh poll."""
+        if not rated_voltage or not rated_frequency:
+            return
+        changed = False
+
+        inputs = [
+            value
+            for key in ("input_voltage_l1", "input_voltage_l2", "input_voltage_l3")
+            if (value := data.get(key)) is not None
+        ]
+        if inputs:
+            changed |= self._update_voltage(
+                "input", min(inputs), max(inputs), rated_voltage, timestamp
+            )
+        if (bypass := data.get("bypass_voltage")) is not None:
+            changed |= self._update_voltage(
+                "bypass", bypass, bypass, rated_voltage, timestamp
+            )
+        for source in SOURCES:
+            # Without voltage the frequency reads 0, which is not an excursion
+            if self._conditions[f"{source}_voltage"].kind == "outage":
+                continue
+            if (frequency := data.get(f"{source}_frequency")) is not None:
+                condition = self._conditions[f"{source}_frequency"]
+                kind = classify_frequency(frequency, rated_frequency, condition.kind)
+                extreme = (
+                    frequency
+                    if abs(frequency - rated_frequency)
+                    > abs(condition.extreme - rated_frequency)
+                    else condition.extreme
+                )
+                changed |= self._transition(
+                    source, condition, kind, frequency, extreme, timestamp
+                )
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _update_voltage(
+        self, source: str, low: float, high: float, nominal: float, timestamp: float
+    ) -> bool:
+        """Update the voltage condition of a source."""
+        condition = self._conditions[f"{source}_voltage"]
+        kind = classify_voltage(low, high, nominal, condition.kind)
+        if kind == "swell":
+            value, extreme = high, max(high, condition.extreme)
+        else:
+            value, extreme = low, min(low, condition.extreme)
+        return self._transition(source, condition, kind, value, extreme, timestamp)
+
+    def _transition(
+        self,
+        source: str,
+        condition: Condition,
+        kind: str | None,
+        value: float,
+        extreme: float,
+        timestamp: float,
+    ) -> bool:
+        """Start, extend or end an event; return True if anything changed."""
+        if kind == condition.kind:
+            if kind is not None:
+                condition.extreme = extreme
+            return False
+
+        if condition.kind is not None:
+            self._finish(source, condition, timestamp)
+        condition.kind = kind
+        if kind is not None:
+            condition.started = timestamp
+            condition.extreme = value
+            self.counts[f"{source}_{kind}"] += 1
+            self.last_event = {
+                "event": f"{source}_{kind}",
+                "start": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                "duration": None,
+                "extreme": value,
+            }
+        return True
+
+    def _finish(self, source: str, condition: Condition, timestamp: float) -> None:
+        """Record the end of the event in progress."""
+        duration = round(timestamp - condition.started)
+        if source == "input" and condition.kind == "outage":
+            self.outage_duration += duration
+        event = f"{source}_{condition.kind}"
+        if self.last_event is not None and self.last_event["event"] == event:
+            self.last_event = {
+                **self.last_event,
+                "duration": duration,
+                "extreme": condition.extreme,
+            }
+
+    def values(self) -> dict[str, Any]:
+        """Return the counters and last event as coordinator values."""
+        last = self.last_event or {}
+        return {
+            **{f"{name}_count": count for name, count in self.counts.items()},
+            "input_outage_duration": round(self.outage_duration),
+            "last_power_event": last.get("event"),
+            "last_power_event_start": last.get("start"),
+            "last_power_event_duration": last.get("duration"),
+            "last_power_event_extreme": last.get("extreme"),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the analyzer state for diagnostics."""
+        return {
+            **self._data_to_save(),
+            "conditions": {
+                name: asdict(condition)
+                for name, condition in self._conditions.items()
+            },
+        }
+
+    async def async_save(self) -> None:
+        """Store the counters now."""
+        await self._store.async_save(self._data_to_save())
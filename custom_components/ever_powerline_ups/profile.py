@@ -0,0 +1,309 @@
+"""Register profiles of Ever Powerline UPS models.
+
+A profile describes the poll blocks of a model family: the address and size
+of each block, which register of it carries which value, and how the value
+is scaled, plus blocks the integration reads only on demand. Profiles are
+JSON files; the bundled ones live in ``profiles``
+next to this module and more can be dropped into
+``ever_powerline_ups/profiles`` of the configuration directory, where they
+take precedence. Values computed from several registers (totals, runtime,
+status names) stay in code and a block refers to them by name.
+
+Each file is validated and compiled once into a decoder per block that
+walks a table of (key, offset, conversion) entries. The compiled profiles
+are kept in ``hass.data`` and shared by all entries; each entry picks the
+first profile whose model and firmware patterns match its identity.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import re
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+
+from .alarms import WARNING_REGISTERS
+from .const import DATA_PROFILES, DOMAIN, PROFILES_DIR
+from .decode import DERIVERS, PollBlock
+from .scheduler import RequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+BUNDLED_PROFILES_DIR = Path(__file__).parent / "profiles"
+DEFAULT_PROFILE_NAME = "Ever Powerline"
+
+# Largest block one Modbus read can return
+MAX_BLOCK_COUNT = 125
+
+FIELD_TYPES: tuple[str, ...] = (
+    "uint",
+    "scaled",
+    "multiplied",
+    "high_byte",
+    "low_byte",
+    "word",
+)
+# Field types and the option each one needs
+_FIELD_OPTIONS: dict[str, str] = {"scaled": "scale", "multiplied": "multiplier"}
+# Fields a block of a given name must have, with their type, because code
+# outside the profile uses them
+REQUIRED_FIELDS: dict[str, dict[str, str]] = {
+    "warnings": {key: "word" for key in WARNING_REGISTERS},
+}
+
+
+def _address(value: Any) -> int:
+    """Validate a register address, given as a number or a "0x" string."""
+    if isinstance(value, str):
+        try:
+            value = int(value, 0)
+        except ValueError as err:
+            raise vol.Invalid(f"invalid register address {value!r}") from err
+    return vol.All(int, vol.Range(min=0, max=0xFFFF))(value)
+
+
+def _pattern(value: Any) -> re.Pattern[str]:
+    """Validate and compile a match pattern."""
+    try:
+        return re.compile(vol.Coerce(str)(value))
+    except re.error as err:
+        raise vol.Invalid(f"invalid pattern {value!r}: {err}") from err
+
+
+FIELD_SCHEMA = vol.Schema(
+    {
+        vol.Required("key"): str,
+        vol.Required("offset"): vol.All(int, vol.Range(min=0)),
+        vol.Optional("type", default="uint"): vol.In(FIELD_TYPES),
+        vol.Optional("scale"): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional("multiplier"): vol.All(int, vol.Range(min=1)),
+    }
+)
+
+BLOCK_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): str,
+        vol.Required("address"): _address,
+        vol.Required("count"): vol.All(int, vol.Range(min=1, max=MAX_BLOCK_COUNT)),
+        vol.Optional("priority", default="measurement"): vol.In(
+            ("alarm", "measurement", "background")
+        ),
+        vol.Optional("derive"): vol.In(tuple(DERIVERS)),
+        vol.Optional("poll", default=True): bool,
+        vol.Required("fields"): vol.All([FIELD_SCHEMA], vol.Length(min=1)),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): str,
+        vol.Optional("match", default={}): {
+            vol.Optional("model", default=[]): [_pattern],
+            vol.Optional("firmware", default=[]): [_pattern],
+        },
+        vol.Required("blocks"): vol.All([BLOCK_SCHEMA], vol.Length(min=1)),
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterProfile:
+    """A compiled register profile."""
+
+    name: str
+    source: str
+    models: tuple[re.Pattern[str], ...]
+    firmware: tuple[re.Pattern[str], ...]
+    # In read order: the small alarm block first, so a slow or failing
+    # measurement read can never hide alarm bits
+    poll_blocks: tuple[PollBlock, ...]
+    # Blocks read only when needed, such as the timer settings
+    on_demand_blocks: tuple[PollBlock, ...] = ()
+
+    @property
+    def generic(self) -> bool:
+        """Return True for a profile that matches every model."""
+        return not self.models and not self.firmware
+
+    def matches(self, model: str, firmware: str) -> bool:
+        """Return True if the profile applies to a model and firmware."""
+        return (
+            not self.models or any(pattern.search(model) for pattern in self.models)
+        ) and (
+            not self.firmware
+            or any(pattern.search(firmware) for pattern in self.firmware)
+        )
+
+    def block(self, name: str) -> PollBlock | None:
+        """Return a poll or on-demand block by name."""
+        return next(
+            (
+                block
+                for block in (*self.poll_blocks, *self.on_demand_blocks)
+                if block.name == name
+            ),
+            None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            "name": self.name,
+            "source": self.source,
+            "blocks": [
+                {
+                    "name": block.name,
+                    "address": block.address,
+                    "count": block.count,
+                    "fields": len(block.fields),
+                    "poll": block in self.poll_blocks,
+                }
+                for block in (*self.poll_blocks, *self.on_demand_blocks)
+            ],
+        }
+
+
+def _converter(field: dict[str, Any]) -> Callable[[int], Any]:
+    """Return the conversion of one register value."""
+    kind = field["type"]
+    if kind == "scaled":
+        scale = field["scale"]
+        return lambda value: None if value == 0xFFFF else value / scale
+    if kind == "multiplied":
+        multiplier = field["multiplier"]
+        return lambda value: None if value == 0xFFFF else value * multiplier
+    if kind == "high_byte":
+        return lambda value: (value >> 8) & 0xFF
+    if kind == "low_byte":
+        return lambda value: value & 0xFF
+    if kind == "word":
+        return lambda value: value
+    return lambda value: None if value == 0xFFFF else value
+
+
+def _compile_block(block: dict[str, Any]) -> PollBlock:
+    """Compile a validated block into a table-walking decoder."""
+    keys: set[str] = set()
+    for field in block["fields"]:
+        if field["offset"] >= block["count"]:
+            raise vol.Invalid(
+                f"{block['name']}.{field['key']}: offset {field['offset']} "
+                f"outside a block of {block['count']} registers"
+            )
+        if field["key"] in keys:
+            raise vol.Invalid(f"{block['name']}: duplicate key {field['key']}")
+        keys.add(field["key"])
+        option = _FIELD_OPTIONS.get(field["type"])
+        if option is not None and option not in field:
+            raise vol.Invalid(
+                f"{block['name']}.{field['key']}: {field['type']} needs {option}"
+            )
+    types = {field["key"]: field["type"] for field in block["fields"]}
+    for key, kind in REQUIRED_FIELDS.get(block["name"], {}).items():
+        if types.get(key) != kind:
+            raise vol.Invalid(f"{block['name']}: needs a {kind} field {key}")
+
+    table = tuple(
+        (field["key"], field["offset"], _converter(field)) for field in block["fields"]
+    )
+    derive = DERIVERS.get(block.get("derive", ""))
+
+    def decode(registers: list[int]) -> dict[str, Any]:
+        data = {key: convert(registers[offset]) for key, offset, convert in table}
+        if derive is not None:
+            derive(data)
+        return data
+
+    return PollBlock(
+        block["name"],
+        block["address"],
+        block["count"],
+        RequestPriority[block["priority"].upper()],
+        decode,
+        tuple((field["key"], field["offset"]) for field in block["fields"]),
+    )
+
+
+def compile_profile(raw: Any, source: str) -> RegisterProfile:
+    """Validate and compile a profile, raise vol.Invalid if it is not valid."""
+    config = PROFILE_SCHEMA(raw)
+    blocks = tuple(_compile_block(block) for block in config["blocks"])
+    polled = [block["poll"] for block in config["blocks"]]
+    names = [block.name for block in blocks]
+    if len(set(names)) != len(names):
+        raise vol.Invalid("duplicate block names")
+    keys = [key for block in blocks for key, _ in block.fields]
+    if len(set(keys)) != len(keys):
+        raise vol.Invalid("a value key is decoded by more than one block")
+    return RegisterProfile(
+        config["name"],
+        source,
+        tuple(config["match"]["model"]),
+        tuple(config["match"]["firmware"]),
+        tuple(block for block, poll in zip(blocks, polled, strict=True) if poll),
+        tuple(block for block, poll in zip(blocks, polled, strict=True) if not poll),
+    )
+
+
+def _load_directory(directory: Path, bundled: bool) -> list[RegisterProfile]:
+    """Load the profiles of one directory, skipping invalid user files."""
+    profiles: list[RegisterProfile] = []
+    for path in sorted(directory.glob("*.json")):
+        source = path.name if bundled else str(path)
+        try:
+            profiles.append(compile_profile(json.loads(path.read_text()), source))
+        except (OSError, ValueError, vol.Invalid) as err:
+            if bundled:
+                raise
+            _LOGGER.error("Ignoring register profile %s: %s", path, err)
+    return profiles
+
+
+def load_profiles(user_directory: Path | None = None) -> tuple[RegisterProfile, ...]:
+    """Load and compile the user and bundled profiles, user ones first."""
+    profiles: list[RegisterProfile] = []
+    if user_directory is not None and user_directory.is_dir():
+        profiles.extend(_load_directory(user_directory, bundled=False))
+    profiles.extend(_load_directory(BUNDLED_PROFILES_DIR, bundled=True))
+    return tuple(profiles)
+
+
+def select_profile(
+    profiles: tuple[RegisterProfile, ...], model: str, firmware: str
+) -> RegisterProfile:
+    """Return the profile for a model and firmware.
+
+    A profile with match patterns wins over a generic one, otherwise the
+    first match in load order is used.
+    """
+    matching = [profile for profile in profiles if profile.matches(model, firmware)]
+    for profile in matching:
+        if not profile.generic:
+            return profile
+    if matching:
+        return matching[0]
+    return next(
+        profile for profile in profiles if profile.name == DEFAULT_PROFILE_NAME
+    )
+
+
+async def async_get_profiles(hass: HomeAssistant) -> tuple[RegisterProfile, ...]:
+    """Return the compiled profiles, loading them on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (loading := domain_data.get(DATA_PROFILES)) is None:
+        user_directory = Path(hass.config.path(PROFILES_DIR))
+        loading = domain_data[DATA_PROFILES] = asyncio.ensure_future(
+            hass.async_add_executor_job(load_profiles, user_directory)
+        )
+    profiles: tuple[RegisterProfile, ...] = await loading
+    return profiles
@@ -0,0 +1,128 @@
+"""Runtime prediction on battery for Ever Powerline UPS.
+
+While the UPS runs on battery, the reported charge is fitted against the
+energy delivered so far (output power integrated over time). The slope is
+the charge used per Wh, which stays put when the load changes, so the
+remaining energy divided by the smoothed output power gives a runtime that
+follows load changes without jumping around. Every sample updates a few
+running sums, so the cost per poll is constant.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+from typing import Any
+
+from .const import OperatingMode
+
+_ON_BATTERY = (OperatingMode.BATTERY, OperatingMode.BATTERY_TEST)
+
+# Time constant of the output power smoothing, seconds
+POWER_SMOOTHING = 60.0
+# Samples and charge drop needed before a prediction is made
+MIN_SAMPLES = 5
+MIN_CHARGE_DROP = 2
+
+
+@dataclass(slots=True)
+class RunningRegression:
+    """Ordinary least squares line kept as running sums."""
+
+    n: int = 0
+    sx: float = 0.0
+    sy: float = 0.0
+    sxx: float = 0.0
+    sxy: float = 0.0
+    syy: float = 0.0
+
+    def add(self, x: float, y: float) -> None:
+        """Add a point."""
+        self.n += 1
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+        self.syy += y * y
+
+    def fit(self) -> tuple[float, float, float] | None:
+        """Return (slope, intercept, standard error of the slope)."""
+        if self.n < 3:
+            return None
+        cxx = self.sxx - self.sx * self.sx / self.n
+        if cxx <= 0:
+            return None
+        cxy = self.sxy - self.sx * self.sy / self.n
+        cyy = self.syy - self.sy * self.sy / self.n
+        slope = cxy / cxx
+        intercept = (self.sy - slope * self.sx) / self.n
+        residual = max(0.0, cyy - slope * cxy) / (self.n - 2)
+        return slope, intercept, math.sqrt(residual / cxx)
+
+
+class RuntimePredictor:
+    """Predict the remaining runtime of one UPS while it is on battery."""
+
+    def __init__(self) -> None:
+        """Initialize the predictor."""
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget the current discharge."""
+        self._fit = RunningRegression()
+        self._energy = 0.0  # Wh delivered since the discharge started
+        self._power: float | None = None  # smoothed output power, W
+        self._last: tuple[float, float] | None = None  # (timestamp, power)
+        self._first_charge: float | None = None
+        self._charge: float | None = None
+
+    def update(self, data: dict[str, Any], timestamp: float) -> None:
+        """Feed one fresh poll."""
+        if data.get("operating_mode") not in _ON_BATTERY:
+            if self._last is not None:
+                self._reset()
+            return
+
+        power = data.get("active_power_total")
+        if power is None:
+            return
+        if self._last is not None:
+            last_time, last_power = self._last
+            dt = max(0.0, timestamp - last_time)
+            self._energy += (last_power + power) / 2 * dt / 3600
+            alpha = 1 - math.exp(-dt / POWER_SMOOTHING)
+            self._power += alpha * (power - self._power)
+        else:
+            self._power = float(power)
+        self._last = (timestamp, power)
+
+        if (charge := data.get("battery_charge")) is not None:
+            self._fit.add(self._energy, charge)
+            self._charge = charge
+            if self._first_charge is None:
+                self._first_charge = charge
+
+    def prediction(self) -> dict[str, Any]:
+        """Return the predicted runtime in minutes and its confidence in %."""
+        empty = {"predicted_runtime": None, "predicted_runtime_confidence": None}
+        if (
+            self._fit.n < MIN_SAMPLES
+            or self._first_charge is None
+            or self._charge is None
+            or self._first_charge - self._charge < MIN_CHARGE_DROP
+            or not self._power
+            or (result := self._fit.fit()) is None
+        ):
+            return empty
+        slope, intercept, slope_error = result
+        if slope >= 0:
+            return empty
+
+        # Charge on the fitted line now, which smooths the 1 % steps
+        charge = max(0.0, intercept + slope * self._energy)
+        remaining = charge / -slope  # Wh
+        confidence = max(0.0, 1 - slope_error / -slope)
+        return {
+            "predicted_runtime": round(remaining / self._power * 60, 1),
+            "predicted_runtime_confidence": round(confidence * 100),
+        }
@@ -0,0 +1,260 @@
+"""Prioritised Modbus request scheduler for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from enum import IntEnum
+import hashlib
+import logging
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_SCHEDULERS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class RequestPriority(IntEnum):
+    """Request priority classes, lowest value is served first."""
+
+    CONTROL = 0
+    ALARM = 1
+    MEASUREMENT = 2
+    BACKGROUND = 3
+
+
+class StaleRequestError(Exception):
+    """Raised when a queued request is dropped before it was sent."""
+
+
+class RequestDeadlineError(TimeoutError):
+    """Raised when a request on the link runs past its deadline."""
+
+
+@dataclass(slots=True)
+class _Request:
+    """A request waiting for its turn on the link."""
+
+    device: Hashable
+    func: Callable[[], Awaitable[Any]]
+    future: asyncio.Future[Any]
+    key: str | None
+    expires: float | None
+    deadline: float | None = None
+    on_abort: Callable[[], None] | None = None
+    task: asyncio.Task[Any] | None = None  # set while the request runs
+
+
+def _retrieve(task: asyncio.Task[Any]) -> None:
+    """Consume the outcome of an abandoned request, nobody awaits it."""
+    if not task.cancelled():
+        task.exception()
+
+
+class ModbusScheduler:
+    """Serialise the requests of all devices sharing one Modbus link.
+
+    Only one request is on the wire at a time. The highest priority class
+    with pending work always goes next, and within a class the devices on
+    the link are served round-robin so a busy device cannot starve the
+    others. Control writes therefore wait for at most one in-flight request
+    instead of a whole poll cycle.
+
+    A request that runs past its deadline, or whose caller is cancelled
+    while it runs, is cancelled and the link goes to the next request
+    right away. The device may still answer the abandoned request, so its
+    ``on_abort`` callback is called to resynchronise the connection before
+    anything else is sent on it.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the scheduler."""
+        self.name = name
+        self._queues: dict[RequestPriority, dict[Hashable, deque[_Request]]] = {
+            priority: {} for priority in RequestPriority
+        }
+        self._rotation: dict[RequestPriority, deque[Hashable]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self._worker: asyncio.Task[None] | None = None
+
+    async def async_submit(
+        self,
+        device: Hashable,
+        priority: RequestPriority,
+        func: Callable[[], Awaitable[_T]],
+        *,
+        key: str | None = None,
+        max_age: float | None = None,
+        deadline: float | None = None,
+        on_abort: Callable[[], None] | None = None,
+    ) -> _T:
+        """Queue a request and wait for its result.
+
+        A request with a ``key`` supersedes any request of the same device
+        and key that is still queued. A request that has waited longer than
+        ``max_age`` seconds is dropped instead of being sent, one that runs
+        longer than ``deadline`` seconds fails with RequestDeadlineError.
+        """
+        loop = asyncio.get_running_loop()
+        if key is not None:
+            self._drop(device, key, "superseded")
+
+        request = _Request(
+            device=device,
+            func=func,
+            future=loop.create_future(),
+            key=key,
+            expires=None if max_age is None else loop.time() + max_age,
+            deadline=deadline,
+            on_abort=on_abort,
+        )
+        queues = self._queues[priority]
+        if device not in queues:
+            queues[device] = deque()
+            self._rotation[priority].append(device)
+        queues[device].append(request)
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(
+                self._async_run(), name=f"{DOMAIN} scheduler {self.name}"
+            )
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            # A queued request is skipped once its future is cancelled, a
+            # running one must not keep the link busy for nobody
+            if request.task is not None:
+                request.task.cancel()
+            raise
+
+    def cancel_device(self, device: Hashable) -> None:
+        """Drop all queued requests of a device."""
+        self._drop(device, None, "device removed")
+
+    def _drop(self, device: Hashable, key: str | None, reason: str) -> None:
+        """Fail queued requests of a device, optionally only those with a key."""
+        for queues in self._queues.values():
+            for request in queues.get(device, ()):
+                if (key is None or request.key == key) and not request.future.done():
+                    request.future.set_exception(
+                        StaleRequestError(f"Request {request.key} {reason}")
+                    )
+
+    def _pop(self) -> _Request | None:
+        """Return the next request to send, or None when idle."""
+        for priority in RequestPriority:
+            rotation = self._rotation[priority]
+            if not rotation:
+                continue
+            queues = self._queues[priority]
+            device = rotation.popleft()
+            queue = queues[device]
+            request = queue.popleft()
+            if queue:
+                rotation.append(device)
+            else:
+                del queues[device]
+            return request
+        return None
+
+    async def _async_run(self) -> None:
+        """Send queued requests until the queues are empty."""
+        loop = asyncio.get_running_loop()
+        request: _Request | None = None
+        try:
+            while (request := self._pop()) is not None:
+                # Cancelled by the caller or superseded while queued
+                if request.future.done():
+                    continue
+                if request.expires is not None and loop.time() > request.expires:
+                    request.future.set_exception(
+                        StaleRequestError(f"Request {request.key} expired in queue")
+                    )
+                    continue
+                await self._async_execute(request)
+        except asyncio.CancelledError:
+            # Stopped with the event loop: leave nothing running or waiting
+            if request is not None:
+                if request.task is not None:
+                    request.task.cancel()
+                if not request.future.done():
+                    request.future.set_exception(
+                        StaleRequestError(f"Request {request.key} scheduler stopped")
+                    )
+            for queues in self._queues.values():
+                for device in list(queues):
+                    self._drop(device, None, "scheduler stopped")
+            raise
+
+    async def _async_execute(self, request: _Request) -> None:
+        """Run one request until it completes, is cancelled or times out."""
+        task = request.task = asyncio.get_running_loop().create_task(request.func())
+        done, _ = await asyncio.wait((task,), timeout=request.deadline)
+        if not done:
+            task.cancel()
+            task.add_done_callback(_retrieve)
+            _LOGGER.debug(
+                "Request %s on %s exceeded its %s s deadline",
+                request.key,
+                self.name,
+                request.deadline,
+            )
+            if not request.future.done():
+                request.future.set_exception(
+                    RequestDeadlineError(
+                        f"Request {request.key} exceeded its {request.deadline} s"
+                        " deadline"
+                    )
+                )
+            self._abort(request)
+        elif task.cancelled():
+            # Its caller was cancelled while it was on the wire
+            self._abort(request)
+        elif (err := task.exception()) is not None:
+            if not request.future.done():
+                request.future.set_exception(err)
+        elif not request.future.done():
+            request.future.set_result(task.result())
+
+    def _abort(self, request: _Request) -> None:
+        """Let the device resynchronise after an abandoned request."""
+        if request.on_abort is None:
+            return
+        try:
+            request.on_abort()
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("Error resynchronising after request %s", request.key)
+
+
+def poll_phase(key: str, interval: float) -> float:
+    """Return the poll offset of a device within the poll interval.
+
+    The offset is derived from a hash of ``key`` (the serial number), so it
+    is the same on every restart and polls of many devices are spread over
+    the interval instead of all firing at the same instant.
+    """
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64 * interval
+
+
+def async_get_scheduler(hass: HomeAssistant, host: str, port: int) -> ModbusScheduler:
+    """Return the scheduler shared by all devices behind one host and port.
+
+    Each address and port is its own link: devices on other ports of the
+    same host (simulators, multi-port serial servers) are not serialised
+    behind each other.
+    """
+    schedulers: dict[tuple[str, int], ModbusScheduler] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(DATA_SCHEDULERS, {})
+    if (link := (host, port)) not in schedulers:
+        _LOGGER.debug("Creating Modbus scheduler for %s:%d", host, port)
+        schedulers[link] = ModbusScheduler(f"{host}:{port}")
+    return schedulers[link]
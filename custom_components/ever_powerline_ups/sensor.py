@@ -1,7 +1,7 @@
 """Sensor platform for Ever Powerline UPS."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -13,9 +13,11 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     UnitOfApparentPower,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
+    UnitOfEnergy,
     UnitOfFrequency,
     UnitOfPower,
     UnitOfTemperature,
@@ -25,8 +27,11 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .aggregates import AGGREGATE_KEYS, AGGREGATE_STATS
 from .const import DOMAIN
 from .coordinator import EverUPSCoordinator
+from .fleet import FleetCoordinator
+from .power_quality import EVENT_NAMES
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -34,6 +39,7 @@ class EverUPSSensorEntityDescription(SensorEntityDescription):
     """Describes Ever UPS sensor entity."""
 
     value_key: str
+    attribute_keys: tuple[str, ...] = ()  # Coordinator values exposed as attributes
 
 
 SENSOR_DESCRIPTIONS: tuple[EverUPSSensorEntityDescription, ...] = (
@@ -207,6 +213,64 @@ SENSOR_DESCRIPTIONS: tuple[EverUPSSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         value_key="apparent_power_total",
     ),
+    # Derived from power, current and rated data
+    EverUPSSensorEntityDescription(
+        key="power_factor_l1",
+        translation_key="power_factor_l1",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="power_factor_l1",
+        entity_registry_enabled_default=False,
+    ),
+    EverUPSSensorEntityDescription(
+        key="power_factor_l2",
+        translation_key="power_factor_l2",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="power_factor_l2",
+        entity_registry_enabled_default=False,
+    ),
+    EverUPSSensorEntityDescription(
+        key="power_factor_l3",
+        translation_key="power_factor_l3",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="power_factor_l3",
+        entity_registry_enabled_default=False,
+    ),
+    EverUPSSensorEntityDescription(
+        key="power_factor_total",
+        translation_key="power_factor_total",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="power_factor_total",
+    ),
+    EverUPSSensorEntityDescription(
+        key="output_current_imbalance",
+        translation_key="output_current_imbalance",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="output_current_imbalance",
+        icon="mdi:scale-unbalanced",
+        entity_registry_enabled_default=False,
+    ),
+    EverUPSSensorEntityDescription(
+        key="active_power_headroom",
+        translation_key="active_power_headroom",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="active_power_headroom",
+    ),
+    EverUPSSensorEntityDescription(
+        key="apparent_power_headroom",
+        translation_key="apparent_power_headroom",
+        native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE,
+        device_class=SensorDeviceClass.APPARENT_POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="apparent_power_headroom",
+        entity_registry_enabled_default=False,
+    ),
     # Load
     EverUPSSensorEntityDescription(
         key="load_l1",
@@ -284,6 +348,16 @@ SENSOR_DESCRIPTIONS: tuple[EverUPSSensorEntityDescription, ...] = (
         value_key="runtime_remaining",
         icon="mdi:timer-outline",
     ),
+    EverUPSSensorEntityDescription(
+        key="predicted_runtime",
+        translation_key="predicted_runtime",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="predicted_runtime",
+        attribute_keys=("predicted_runtime_confidence",),
+        icon="mdi:timer-sand-complete",
+    ),
     # Bypass
     EverUPSSensorEntityDescription(
         key="bypass_frequency",
@@ -351,6 +425,146 @@ SENSOR_DESCRIPTIONS: tuple[EverUPSSensorEntityDescription, ...] = (
         options=["Charging", "Float Charging", "Resting", "Discharging", "Disabled"],
         entity_registry_enabled_default=False,
     ),
+    # Battery health
+    EverUPSSensorEntityDescription(
+        key="battery_energy_estimate",
+        translation_key="battery_energy_estimate",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY_STORAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="battery_energy_estimate",
+        icon="mdi:battery-heart-variant",
+    ),
+    EverUPSSensorEntityDescription(
+        key="battery_energy_trend",
+        translation_key="battery_energy_trend",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="battery_energy_trend",
+        icon="mdi:chart-line",
+        entity_registry_enabled_default=False,
+    ),
+    EverUPSSensorEntityDescription(
+        key="battery_voltage_under_load",
+        translation_key="battery_voltage_under_load",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="battery_voltage_under_load",
+        entity_registry_enabled_default=False,
+    ),
+    # Power quality
+    EverUPSSensorEntityDescription(
+        key="input_outage_duration",
+        translation_key="input_outage_duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_key="input_outage_duration",
+        icon="mdi:power-plug-off",
+    ),
+    EverUPSSensorEntityDescription(
+        key="last_power_event",
+        translation_key="last_power_event",
+        device_class=SensorDeviceClass.ENUM,
+        value_key="last_power_event",
+        attribute_keys=(
+            "last_power_event_start",
+            "last_power_event_duration",
+            "last_power_event_extreme",
+        ),
+        icon="mdi:flash-alert",
+        options=list(EVENT_NAMES),
+    ),
+    # Warnings
+    EverUPSSensorEntityDescription(
+        key="active_warnings",
+        translation_key="active_warnings",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="active_warning_count",
+        attribute_keys=("active_warnings",),
+        icon="mdi:alert",
+    ),
+    # Diagnostics
+    EverUPSSensorEntityDescription(
+        key="data_age",
+        translation_key="data_age",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_key="data_age",
+        icon="mdi:timer-sand",
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+def _aggregate_descriptions() -> tuple[EverUPSSensorEntityDescription, ...]:
+    """Return the window min/max/mean sensors of the aggregated measurements."""
+    base = {description.key: description for description in SENSOR_DESCRIPTIONS}
+    return tuple(
+        replace(
+            base[key],
+            key=f"{key}_{stat}",
+            translation_key=f"{key}_{stat}",
+            value_key=f"{key}_{stat}",
+            entity_registry_enabled_default=False,
+        )
+        for key in AGGREGATE_KEYS
+        for stat in AGGREGATE_STATS
+    )
+
+
+AGGREGATE_SENSOR_DESCRIPTIONS = _aggregate_descriptions()
+
+# Power quality event counters, the bypass ones disabled by default
+POWER_QUALITY_SENSOR_DESCRIPTIONS: tuple[EverUPSSensorEntityDescription, ...] = tuple(
+    EverUPSSensorEntityDescription(
+        key=f"{name}_count",
+        translation_key=f"{name}_count",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_key=f"{name}_count",
+        icon="mdi:counter",
+        entity_registry_enabled_default=name.startswith("input_"),
+    )
+    for name in EVENT_NAMES
+)
+
+# Site totals of the fleet entry
+FLEET_SENSOR_DESCRIPTIONS: tuple[EverUPSSensorEntityDescription, ...] = (
+    EverUPSSensorEntityDescription(
+        key="fleet_active_power",
+        translation_key="fleet_active_power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="active_power_total",
+    ),
+    EverUPSSensorEntityDescription(
+        key="fleet_runtime_min",
+        translation_key="fleet_runtime_min",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="runtime_remaining_min",
+        attribute_keys=("runtime_remaining_min_ups",),
+        icon="mdi:timer-outline",
+    ),
+    EverUPSSensorEntityDescription(
+        key="fleet_ups_online",
+        translation_key="fleet_ups_online",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="ups_online",
+        attribute_keys=("ups_count",),
+        icon="mdi:server-network",
+    ),
+    EverUPSSensorEntityDescription(
+        key="fleet_power_fail_count",
+        translation_key="fleet_power_fail_count",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_key="power_fail_count",
+        icon="mdi:power-plug-off",
+    ),
 )
 
 
@@ -360,11 +574,23 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Ever UPS sensors based on a config entry."""
+    if isinstance(entry.runtime_data, FleetCoordinator):
+        async_add_entities(
+            EverFleetSensor(entry.runtime_data, description)
+            for description in FLEET_SENSOR_DESCRIPTIONS
+        )
+        return
+
     coordinator: EverUPSCoordinator = entry.runtime_data
 
     entities = [
         EverUPSSensor(coordinator, description)
-        for description in SENSOR_DESCRIPTIONS
+        for description in (
+            *SENSOR_DESCRIPTIONS,
+            *AGGREGATE_SENSOR_DESCRIPTIONS,
+            *POWER_QUALITY_SENSOR_DESCRIPTIONS,
+        )
+        if coordinator.capabilities.supports(description.value_key)
     ]
 
     async_add_entities(entities)
@@ -387,9 +613,60 @@ class EverUPSSensor(CoordinatorEntity[EverUPSCoordinator], SensorEntity):
         self._attr_unique_id = f"{coordinator.serial_number or coordinator.host}_{description.key}"
         self._attr_device_info = coordinator.device_info
 
+    @property
+    def available(self) -> bool:
+        """Return True if the register block behind the value has data."""
+        return (
+            super().available
+            and self.entity_description.value_key in self.coordinator.data
+        )
+
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
         if self.coordinator.data is None:
             return None
         return self.coordinator.data.get(self.entity_description.value_key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the coordinator values listed as attributes."""
+        if not self.entity_description.attribute_keys or self.coordinator.data is None:
+            return None
+        return {
+            key: self.coordinator.data.get(key)
+            for key in self.entity_description.attribute_keys
+        }
+
+
+class EverFleetSensor(CoordinatorEntity[FleetCoordinator], SensorEntity):
+    """Representation of a site total."""
+
+    entity_description: EverUPSSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: FleetCoordinator,
+        description: EverUPSSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get(self.entity_description.value_key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the coordinator values listed as attributes."""
+        if not self.entity_description.attribute_keys:
+            return None
+        return {
+            key: self.coordinator.data.get(key)
+            for key in self.entity_description.attribute_keys
+        }
@@ -0,0 +1,206 @@
+"""Services for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .capabilities import async_remove_capabilities
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DURATION,
+    ATTR_FILENAME,
+    ATTR_INCLUDE_SAMPLES,
+    ATTR_SPEED,
+    CONF_FLEET,
+    DOMAIN,
+    RECORDINGS_DIR,
+    SERVICE_GET_BATTERY_TESTS,
+    SERVICE_PROBE_CAPABILITIES,
+    SERVICE_REPLAY_RECORDING,
+    SERVICE_START_BATTERY_TEST,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_RECORDING,
+)
+from .frames import read_frames
+
+if TYPE_CHECKING:
+    from .coordinator import EverUPSCoordinator
+
+# A bare file name, recordings always live in RECORDINGS_DIR
+_FILENAME = vol.All(cv.string, vol.Match(r"^[\w.-]+$"))
+
+START_RECORDING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): _FILENAME,
+        vol.Optional(ATTR_DURATION): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    }
+)
+
+STOP_RECORDING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+REPLAY_RECORDING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILENAME): _FILENAME,
+        vol.Optional(ATTR_SPEED, default=10.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+START_BATTERY_TEST_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+PROBE_CAPABILITIES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+GET_BATTERY_TESTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_INCLUDE_SAMPLES, default=False): cv.boolean,
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> EverUPSCoordinator:
+    """Return the coordinator of the config entry a service call targets."""
+    entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            f"{call.data[ATTR_CONFIG_ENTRY_ID]} is not an Ever Powerline UPS entry"
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"{entry.title} is not loaded")
+    if entry.data.get(CONF_FLEET):
+        raise ServiceValidationError(f"{entry.title} is not a UPS")
+    return entry.runtime_data
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def _async_start_recording(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        filename = call.data.get(ATTR_FILENAME) or (
+            f"{coordinator.serial_number or coordinator.host}_"
+            f"{dt_util.now().strftime('%Y%m%d_%H%M%S')}.evf"
+        )
+        path = Path(hass.config.path(RECORDINGS_DIR, filename))
+        await coordinator.async_start_recording(path, call.data.get(ATTR_DURATION))
+        return {"path": str(path)}
+
+    async def _async_stop_recording(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        if (recorder := await coordinator.async_stop_recording()) is None:
+            raise ServiceValidationError("No recording in progress")
+        return {"path": str(recorder.path), "frames": recorder.frame_count}
+
+    async def _async_replay_recording(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        if coordinator.replaying:
+            raise ServiceValidationError("A replay is already running")
+        path = Path(hass.config.path(RECORDINGS_DIR, call.data[ATTR_FILENAME]))
+        try:
+            frames = await hass.async_add_executor_job(read_frames, path)
+        except (OSError, ValueError) as err:
+            raise ServiceValidationError(f"Cannot read {path}: {err}") from err
+        if coordinator.replaying:
+            raise ServiceValidationError("A replay is already running")
+        replay = await coordinator.async_replay(frames, call.data[ATTR_SPEED])
+        return {
+            "frames": len(frames),
+            "polls": replay.polls,
+            "active_warnings": replay.warnings.active,
+        }
+
+    async def _async_start_battery_test(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        if coordinator.battery_test.run is not None:
+            raise ServiceValidationError("A battery test is already running")
+        if not await coordinator.battery_test.async_start():
+            raise HomeAssistantError("The UPS did not accept the battery test command")
+        await coordinator.async_request_refresh()
+
+    async def _async_get_battery_tests(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        tests = coordinator.battery_test.history
+        if not call.data[ATTR_INCLUDE_SAMPLES]:
+            tests = [
+                {key: value for key, value in test.items() if key != "samples"}
+                for test in tests
+            ]
+        return {"running": coordinator.battery_test.run is not None, "tests": tests}
+
+    async def _async_probe_capabilities(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        # The reload probes again and creates the entities found supported
+        await async_remove_capabilities(hass, coordinator.entry)
+        await hass.config_entries.async_reload(coordinator.entry.entry_id)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        _async_start_recording,
+        schema=START_RECORDING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        _async_stop_recording,
+        schema=STOP_RECORDING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY_RECORDING,
+        _async_replay_recording,
+        schema=REPLAY_RECORDING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_BATTERY_TEST,
+        _async_start_battery_test,
+        schema=START_BATTERY_TEST_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_BATTERY_TESTS,
+        _async_get_battery_tests,
+        schema=GET_BATTERY_TESTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROBE_CAPABILITIES,
+        _async_probe_capabilities,
+        schema=PROBE_CAPABILITIES_SCHEMA,
+    )
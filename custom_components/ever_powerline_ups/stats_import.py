@@ -0,0 +1,289 @@
+"""Long-term statistics import for Ever Powerline UPS.
+
+With statistics import enabled, every poll sample is folded into hourly
+mean/min/max buckets (and an output energy sum) in memory. Finished hours
+are imported as external statistics in one batch per statistic, so fast
+polling gives full resolution statistics without writing every sample as
+a state. The recorder is only imported once the first hour is finished.
+The open hour and the finished hours not imported yet are stored when the
+entry unloads and picked up again, so a reload or restart does not lose
+the samples so far.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import astuple, dataclass
+from datetime import datetime, timezone
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .storage import STORE_STATISTICS, entry_store
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+# Longer gaps between samples are not integrated into the energy sum: at
+# least MIN_ENERGY_GAP seconds, and enough for one missed poll
+MIN_ENERGY_GAP = 60.0
+ENERGY_GAP_POLLS = 2.5
+
+
+@dataclass(frozen=True, slots=True)
+class StatisticSpec:
+    """A measurement imported as mean/min/max statistics."""
+
+    key: str
+    name: str
+    unit: str
+
+
+STATISTIC_SPECS: tuple[StatisticSpec, ...] = (
+    StatisticSpec(
+        "input_voltage_l1", "Input voltage L1", UnitOfElectricPotential.VOLT
+    ),
+    StatisticSpec(
+        "output_voltage_l1", "Output voltage L1", UnitOfElectricPotential.VOLT
+    ),
+    StatisticSpec("load_total", "Load", PERCENTAGE),
+    StatisticSpec("active_power_total", "Active power", UnitOfPower.WATT),
+    StatisticSpec("battery_charge", "Battery charge", PERCENTAGE),
+    StatisticSpec("temperature", "Temperature", UnitOfTemperature.CELSIUS),
+)
+ENERGY_KEY = "output_energy"
+
+
+@dataclass(slots=True)
+class _Bucket:
+    """Samples of one statistic in one hour."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+
+class StatisticsImporter:
+    """Buffer poll samples and import them as hourly statistics."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, poll_interval: float
+    ) -> None:
+        """Initialize the importer."""
+        self._hass = hass
+        self._entry = entry
+        self._store = entry_store(hass, entry, STORE_STATISTICS)
+        self._max_energy_gap = max(MIN_ENERGY_GAP, ENERGY_GAP_POLLS * poll_interval)
+        self._prefix = slugify(entry.unique_id or entry.entry_id)
+        self._hour: int | None = None
+        self._buckets: dict[str, _Bucket] = {}
+        self._energy = 0.0  # Wh delivered in the current hour
+        self._last_power: tuple[float, float] | None = None
+        # Finished hours waiting for import: (start, buckets, energy Wh)
+        self._pending: list[tuple[int, dict[str, _Bucket], float]] = []
+        self._import_task: asyncio.Task[None] | None = None
+        self._energy_sum: float | None = None  # kWh, continued from the recorder
+
+    async def async_load(self) -> None:
+        """Restore the hour that was open when the entry unloaded."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self._pending = [
+            (
+                start,
+                {key: _Bucket(*values) for key, values in buckets.items()},
+                energy,
+            )
+            for start, buckets, energy in stored.get("pending", [])
+        ]
+        self._hour = stored.get("hour")
+        self._buckets = {
+            key: _Bucket(*values) for key, values in stored.get("buckets", {}).items()
+        }
+        self._energy = stored.get("energy", 0.0)
+        if (last_power := stored.get("last_power")) is not None:
+            self._last_power = (last_power[0], last_power[1])
+        if self._pending:
+            self._async_start_import()
+
+    async def async_save(self) -> None:
+        """Store the open hour and the hours not imported yet."""
+        await self._store.async_save(
+            {
+                "hour": self._hour,
+                "buckets": {
+                    key: astuple(bucket) for key, bucket in self._buckets.items()
+                },
+                "energy": self._energy,
+                "last_power": self._last_power,
+                "pending": [
+                    (
+                        start,
+                        {key: astuple(bucket) for key, bucket in buckets.items()},
+                        energy,
+                    )
+                    for start, buckets, energy in self._pending
+                ],
+            }
+        )
+
+    async def async_stop(self) -> None:
+        """Stop a running import and store what is left for the next setup."""
+        if (task := self._import_task) is not None:
+            task.cancel()
+            await asyncio.wait([task])
+            self._import_task = None
+        await self.async_save()
+
+    def statistic_id(self, key: str) -> str:
+        """Return the external statistic id of a key."""
+        return f"{DOMAIN}:{self._prefix}_{key}"
+
+    @callback
+    def async_add(self, data: dict[str, Any], timestamp: float) -> None:
+        """Fold one fresh poll into the current hour."""
+        hour = int(timestamp // HOUR) * HOUR
+        if self._hour is not None and hour != self._hour:
+            self._pending.append((self._hour, self._buckets, self._energy))
+            self._buckets = {}
+            self._energy = 0.0
+            self._async_start_import()
+        self._hour = hour
+
+        for spec in STATISTIC_SPECS:
+            if (value := data.get(spec.key)) is not None:
+                if (bucket := self._buckets.get(spec.key)) is None:
+                    bucket = self._buckets[spec.key] = _Bucket()
+                bucket.add(value)
+
+        if (power := data.get("active_power_total")) is not None:
+            if self._last_power is not None:
+                last_time, last_power = self._last_power
+                dt = timestamp - last_time
+                if 0 < dt <= self._max_energy_gap:
+                    self._energy += (last_power + power) / 2 * dt / HOUR
+            self._last_power = (timestamp, power)
+
+    @callback
+    def _async_start_import(self) -> None:
+        """Import the finished hours unless an import is running."""
+        if self._import_task is not None:
+            return
+        self._import_task = self._entry.async_create_background_task(
+            self._hass, self._async_import(), name=f"{DOMAIN} statistics import"
+        )
+
+    async def _async_import(self) -> None:
+        """Import all finished hours."""
+        try:
+            if "recorder" not in self._hass.config.components:
+                _LOGGER.debug("Recorder not loaded, dropping buffered statistics")
+                self._pending.clear()
+                return
+            while self._pending:
+                # Hours leave the queue only once imported, so an unload
+                # during the import stores them for the next setup
+                pending = self._pending[:]
+                await self._async_import_hours(pending)
+                del self._pending[: len(pending)]
+        finally:
+            self._import_task = None
+
+    async def _async_import_hours(
+        self, hours: list[tuple[int, dict[str, _Bucket], float]]
+    ) -> None:
+        """Import a batch of finished hours, one call per statistic.
+
+        The only await comes first; once the hours are handed to the
+        recorder the batch is complete.
+        """
+        # Imported here so the recorder is not loaded with the integration
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.models import (
+            StatisticData,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+            get_last_statistics,
+        )
+
+        energy_id = self.statistic_id(ENERGY_KEY)
+        if self._energy_sum is None:
+            last = await get_instance(self._hass).async_add_executor_job(
+                get_last_statistics, self._hass, 1, energy_id, True, {"sum"}
+            )
+            rows = last.get(energy_id)
+            self._energy_sum = (rows[0].get("sum") if rows else None) or 0.0
+
+        title = self._entry.title
+        for spec in STATISTIC_SPECS:
+            statistics = [
+                StatisticData(
+                    start=datetime.fromtimestamp(start, timezone.utc),
+                    mean=bucket.total / bucket.count,
+                    min=bucket.min,
+                    max=bucket.max,
+                )
+                for start, buckets, _ in hours
+                if (bucket := buckets.get(spec.key)) is not None
+            ]
+            if statistics:
+                async_add_external_statistics(
+                    self._hass,
+                    StatisticMetaData(
+                        has_mean=True,
+                        has_sum=False,
+                        name=f"{title} {spec.name}",
+                        source=DOMAIN,
+                        statistic_id=self.statistic_id(spec.key),
+                        unit_of_measurement=spec.unit,
+                    ),
+                    statistics,
+                )
+
+        energy = []
+        for start, _, wh in hours:
+            self._energy_sum += wh / 1000
+            energy.append(
+                StatisticData(
+                    start=datetime.fromtimestamp(start, timezone.utc),
+                    state=self._energy_sum,
+                    sum=self._energy_sum,
+                )
+            )
+        async_add_external_statistics(
+            self._hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{title} Output energy",
+                source=DOMAIN,
+                statistic_id=energy_id,
+                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            ),
+            energy,
+        )
+        _LOGGER.debug("Imported %d hours of statistics for %s", len(hours), title)
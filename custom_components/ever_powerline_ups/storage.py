@@ -0,0 +1,40 @@
+"""Per-entry persistent storage for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORE_VERSION = 1
+
+# Every store kept per entry, removed together with the entry
+STORE_BATTERY_TESTS = "battery_tests"
+STORE_BATTERY_HEALTH = "battery_health"
+STORE_POWER_QUALITY = "power_quality"
+STORE_CAPABILITIES = "capabilities"
+STORE_STATISTICS = "statistics"
+STORE_NAMES: tuple[str, ...] = (
+    STORE_BATTERY_TESTS,
+    STORE_BATTERY_HEALTH,
+    STORE_POWER_QUALITY,
+    STORE_CAPABILITIES,
+    STORE_STATISTICS,
+)
+
+
+def entry_store(
+    hass: HomeAssistant, entry: ConfigEntry, name: str
+) -> Store[dict[str, Any]]:
+    """Return the store ``name`` of a config entry."""
+    return Store(hass, STORE_VERSION, f"{DOMAIN}.{entry.entry_id}.{name}")
+
+
+async def async_remove_entry_stores(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove all stores of a config entry."""
+    for name in STORE_NAMES:
+        await entry_store(hass, entry, name).async_remove()
@@ -0,0 +1,150 @@
+"""Coalescing register write queue for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import datetime
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+WriteFunc = Callable[[int, list[int]], Awaitable[bool]]
+ReadFunc = Callable[[int, int], Awaitable[list[int] | None]]
+
+# Read-back attempts before a write counts as not verified
+VERIFY_READS = 2
+
+
+def contiguous_ranges(words: dict[int, int]) -> Iterator[tuple[int, list[int]]]:
+    """Yield (start address, values) for each run of adjacent addresses."""
+    start: int | None = None
+    values: list[int] = []
+    for address in sorted(words):
+        if start is not None and address != start + len(values):
+            yield start, values
+            start = None
+        if start is None:
+            start, values = address, []
+        values.append(words[address])
+    if start is not None:
+        yield start, values
+
+
+class RegisterWriteQueue:
+    """Collect register writes for a short window and send them together.
+
+    Every address keeps only its latest value, adjacent addresses are merged
+    into one ``write_registers`` request and the whole written span is read
+    back once to verify the device accepted it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write: WriteFunc,
+        read: ReadFunc,
+        delay: float,
+    ) -> None:
+        """Initialize the write queue."""
+        self._hass = hass
+        self._write = write
+        self._read = read
+        self._delay = delay
+        self._pending: dict[int, int] = {}
+        self._waiters: list[asyncio.Future[bool]] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        # Last values known to be in the device, by address
+        self.values: dict[int, int] = {}
+
+    async def async_write(self, address: int, values: list[int]) -> bool:
+        """Queue values starting at address and wait until they are written."""
+        for offset, value in enumerate(values):
+            self._pending[address + offset] = value
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        self._waiters.append(future)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, self._delay, self._async_schedule_flush
+            )
+        return await future
+
+    @callback
+    def _async_schedule_flush(self, _now: datetime) -> None:
+        """Flush the queue once the coalescing window has passed."""
+        self._unsub_flush = None
+        self._hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> bool:
+        """Write all pending values and verify them with one read-back."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, []
+        if not pending:
+            return True
+
+        success = False
+        try:
+            written = True
+            for start, values in contiguous_ranges(pending):
+                _LOGGER.debug(
+                    "Writing %d register(s) at 0x%04X", len(values), start
+                )
+                if not await self._write(start, values):
+                    written = False
+            success = written and await self._async_verify(pending)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.error("Error writing registers: %s", err)
+            success = False
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(success)
+        return success
+
+    async def _async_verify(self, written: dict[int, int]) -> bool:
+        """Read back the written span and compare it with what was sent."""
+        first = min(written)
+        count = max(written) - first + 1
+        registers: list[int] | None = None
+        for _ in range(VERIFY_READS):
+            if (registers := await self._read(first, count)) is not None:
+                break
+        if registers is None:
+            # The device may or may not hold the values, keep the old ones
+            _LOGGER.error(
+                "Could not verify write at 0x%04X, read-back failed", first
+            )
+            return False
+
+        self.values.update(
+            (first + offset, value) for offset, value in enumerate(registers)
+        )
+        mismatched = [
+            address
+            for address, value in written.items()
+            if registers[address - first] != value
+        ]
+        if mismatched:
+            _LOGGER.error(
+                "UPS did not accept write to %s",
+                ", ".join(f"0x{address:04X}" for address in mismatched),
+            )
+            return False
+        return True
+
+    def cancel(self) -> None:
+        """Drop pending writes, failing anyone still waiting for them."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending.clear()
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(False)
+        self._waiters.clear()
@@ -0,0 +1,58 @@
+"""Time the poll decode path on a recorded frame file.
+
+    python scripts/benchmark_decode.py recording.evf
+
+Recordings are made with the ``ever_powerline_ups.start_recording`` service.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.ever_powerline_ups.frames import read_frames  # noqa: E402
+from custom_components.ever_powerline_ups.profile import (  # noqa: E402
+    load_profiles,
+    select_profile,
+)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--model", default="", help="model to pick the profile")
+    parser.add_argument("--firmware", default="")
+    parser.add_argument("--profiles", type=Path, help="user profile directory")
+    args = parser.parse_args()
+
+    profile = select_profile(load_profiles(args.profiles), args.model, args.firmware)
+    frames = read_frames(args.recording)
+    blocks = {block.address: block for block in profile.poll_blocks}
+    work = [
+        (blocks[frame.address].decode, list(frame.registers))
+        for frame in frames
+        if frame.address in blocks
+    ]
+    if not work:
+        sys.exit("No poll frames in recording")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for decode, registers in work:
+            decode(registers)
+    elapsed = time.perf_counter() - start
+
+    decoded = len(work) * args.repeat
+    print(f"Profile {profile.name} ({profile.source})")
+    print(f"{len(frames)} frames, {len(work)} poll blocks")
+    print(f"{elapsed / decoded * 1e6:.2f} us per block decode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Measure how long importing the integration takes.
+
+Home Assistant modules the integration depends on are imported first, so the
+numbers only cover what loading the integration itself adds at startup.
+
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --baseline v1.0.7
+
+With ``--baseline`` the same measurement is taken on a git ref for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.ever_powerline_ups"
+
+PRELOAD = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.event",
+    "voluptuous",
+)
+MODULES = (PACKAGE, f"{PACKAGE}.config_flow")
+
+
+def measure(root: Path) -> tuple[float, bool]:
+    """Return (microseconds added by the import, whether pymodbus was loaded)."""
+    code = (
+        "import importlib, sys\n"
+        f"for name in {PRELOAD!r}: importlib.import_module(name)\n"
+        "print('--start--', file=sys.stderr)\n"
+        f"for name in {MODULES!r}: importlib.import_module(name)\n"
+        "print('pymodbus' in sys.modules)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    started = False
+    for line in proc.stderr.splitlines():
+        if line == "--start--":
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        # "import time: self [us] | cumulative | imported package"
+        self_us = line.split(":", 1)[1].split("|")[0].strip()
+        if self_us.isdigit():
+            total += int(self_us)
+    return float(total), proc.stdout.strip() == "True"
+
+
+def report(label: str, root: Path, runs: int) -> float:
+    """Print the median of several runs and return it."""
+    results = [measure(root) for _ in range(runs)]
+    median = statistics.median(total for total, _ in results)
+    loaded = results[0][1]
+    print(
+        f"{label}: {median / 1000:.1f} ms, pymodbus imported: {'yes' if loaded else 'no'}"
+    )
+    return median
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--baseline", help="git ref to compare against")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    current = report("working tree", ROOT, args.runs)
+    if not args.baseline:
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = Path(tmp) / "baseline.tar"
+        subprocess.run(
+            ["git", "archive", "-o", str(archive), args.baseline, "custom_components"],
+            cwd=ROOT,
+            check=True,
+        )
+        with tarfile.open(archive) as tar:
+            tar.extractall(tmp)
+        baseline = report(args.baseline, Path(tmp), args.runs)
+
+    print(f"difference: {(baseline - current) / 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
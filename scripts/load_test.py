@@ -0,0 +1,285 @@
+"""Fleet load test: many simulated UPS monitored by one Home Assistant.
+
+    python scripts/load_test.py --count 50 --duration 120
+    python scripts/load_test.py --count 200 --latency 0.02 --json > run.json
+    python scripts/load_test.py --count 5 --hang-rate 0.05 --hang-time 8
+
+Starts ``--count`` simulated devices (see ``ups_simulator.py``) on local
+ports, each its own link with its own request scheduler as with real
+devices, boots Home Assistant in a temporary config directory with this
+integration linked in and adds one config entry per device. After a warm-up
+the run reports event loop lag, poll success rate, poll latency, memory per
+entry and state writes per second, so scaling can be compared between
+versions. With ``--hang-rate`` the simulators leave requests hanging; the
+control write latency (one timer register write per entry every
+``--write-interval`` seconds) then shows whether writes still get through
+while reads are stuck. Needs ``homeassistant`` and ``pymodbus`` installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import importlib
+import json
+import os
+from pathlib import Path
+import resource
+import sys
+import tempfile
+import time
+from typing import Any
+
+from ups_simulator import async_start_fleet
+
+ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "ever_powerline_ups"
+
+CONFIGURATION = """\
+homeassistant:
+  name: Load test
+  unit_system: metric
+  time_zone: UTC
+logger:
+  default: warning
+"""
+
+
+@dataclass
+class Stats:
+    """Samples collected during the measured part of the run."""
+
+    measuring: bool = False
+    polls_ok: int = 0
+    polls_failed: int = 0
+    polls_stale: int = 0
+    poll_latency: list[float] = field(default_factory=list)
+    loop_lag: list[float] = field(default_factory=list)
+    state_writes: int = 0
+    writes_failed: int = 0
+    write_latency: list[float] = field(default_factory=list)
+
+
+def rss_bytes() -> int:
+    """Return the resident set size of this process."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current RSS, still fine for a growing process
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Return the value below which ``share`` of the samples fall."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def instrument(stats: Stats) -> None:
+    """Time every poll of every coordinator."""
+    module = importlib.import_module(f"custom_components.{DOMAIN}.coordinator")
+    coordinator_cls = module.EverUPSCoordinator
+    original = coordinator_cls._async_update_data
+
+    async def _timed_update(self: Any) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            data = await original(self)
+        except Exception:
+            if stats.measuring:
+                stats.polls_failed += 1
+            raise
+        if stats.measuring:
+            stats.polls_ok += 1
+            stats.polls_stale += bool(data.get("stale"))
+            stats.poll_latency.append(time.perf_counter() - start)
+        return data
+
+    coordinator_cls._async_update_data = _timed_update
+
+
+async def monitor_loop_lag(stats: Stats, interval: float = 0.05) -> None:
+    """Sample how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        if stats.measuring:
+            stats.loop_lag.append(loop.time() - start - interval)
+
+
+async def exercise_writes(hass: Any, stats: Stats, interval: float) -> None:
+    """Write a timer register of every entry, as a number entity would."""
+    async def _write(coordinator: Any) -> None:
+        start = time.perf_counter()
+        # The shutdown delay LSB, with the value the simulator starts with
+        ok = await coordinator.async_write_register(0x0101, 120)
+        if stats.measuring:
+            stats.write_latency.append(time.perf_counter() - start)
+            stats.writes_failed += not ok
+
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.gather(
+            *(
+                _write(entry.runtime_data)
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if hasattr(entry, "runtime_data")
+            )
+        )
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the load test and return the results."""
+    # Imported here so --help works without Home Assistant installed
+    from homeassistant import bootstrap, runner
+    from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntryState
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.core import callback
+
+    devices, servers = await async_start_fleet(
+        args.count,
+        base_port=args.base_port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_time=args.hang_time,
+    )
+    stats = Stats()
+
+    with tempfile.TemporaryDirectory(prefix="ever_load_test_") as config_dir:
+        config_path = Path(config_dir)
+        (config_path / "configuration.yaml").write_text(CONFIGURATION)
+        (config_path / "custom_components").mkdir()
+        (config_path / "custom_components" / DOMAIN).symlink_to(
+            ROOT / "custom_components" / DOMAIN
+        )
+
+        hass = await bootstrap.async_setup_hass(
+            runner.RuntimeConfig(config_dir=config_dir, skip_pip=True)
+        )
+        if hass is None:
+            sys.exit("Home Assistant failed to start")
+        await hass.async_start()
+
+        # Home Assistant put the config directory on sys.path, so this is the
+        # module the config entries will load
+        instrument(stats)
+
+        @callback
+        def _count_state_write(_event: Any) -> None:
+            if stats.measuring:
+                stats.state_writes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+        lag_task = asyncio.create_task(monitor_loop_lag(stats))
+
+        rss_before = rss_bytes()
+        setup_start = time.perf_counter()
+        for device, server in zip(devices, servers, strict=True):
+            host, port = server.sockets[0].getsockname()[:2]
+            await hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={
+                    "host": host,
+                    "port": port,
+                    "identity": {
+                        "model": "SIMULATOR",
+                        "serial_number": device.serial,
+                    },
+                },
+            )
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - setup_start
+
+        write_task = None
+        if args.write_interval > 0:
+            write_task = asyncio.create_task(
+                exercise_writes(hass, stats, args.write_interval)
+            )
+
+        await asyncio.sleep(args.warmup)
+        rss_after = rss_bytes()
+        requests_before = sum(device.requests for device in devices)
+        stats.measuring = True
+        await asyncio.sleep(args.duration)
+        stats.measuring = False
+        requests = sum(device.requests for device in devices) - requests_before
+
+        entries = hass.config_entries.async_entries(DOMAIN)
+        loaded = sum(entry.state is ConfigEntryState.LOADED for entry in entries)
+
+        lag_task.cancel()
+        if write_task is not None:
+            write_task.cancel()
+        await hass.async_stop()
+
+    for server in servers:
+        server.close()
+
+    polls = stats.polls_ok + stats.polls_failed
+    return {
+        "devices": args.count,
+        "entries_loaded": loaded,
+        "setup_seconds": round(setup_time, 2),
+        "duration_seconds": args.duration,
+        "polls": polls,
+        "poll_success_rate": round(stats.polls_ok / polls, 4) if polls else 0.0,
+        "polls_stale": stats.polls_stale,
+        "poll_latency_ms": {
+            name: round(percentile(stats.poll_latency, share) * 1000, 1)
+            for name, share in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1))
+        },
+        "loop_lag_ms": {
+            name: round(percentile(stats.loop_lag, share) * 1000, 1)
+            for name, share in (("p50", 0.5), ("p99", 0.99), ("max", 1))
+        },
+        "memory_per_entry_kib": round(
+            max(0, rss_after - rss_before) / max(1, args.count) / 1024, 1
+        ),
+        "state_writes_per_second": round(stats.state_writes / args.duration, 1),
+        "modbus_requests_per_second": round(requests / args.duration, 1),
+        "requests_hung": sum(device.hangs for device in devices),
+        "control_writes_failed": stats.writes_failed,
+        "control_write_latency_ms": {
+            name: round(percentile(stats.write_latency, share) * 1000, 1)
+            for name, share in (("p50", 0.5), ("p99", 0.99), ("max", 1))
+        },
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the test and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--warmup", type=float, default=15.0)
+    parser.add_argument("--base-port", type=int, default=5020)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-time", type=float, default=0.0)
+    parser.add_argument(
+        "--write-interval", type=float, default=5.0, help="0 disables writes"
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for key, value in results.items():
+        if isinstance(value, dict):
+            value = "  ".join(f"{name} {sample}" for name, sample in value.items())
+        print(f"{key:28} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Simulated EVER UPS devices speaking Modbus TCP.
+
+Serves the register map the integration reads (identifiers, warnings,
+status, measurements, rated data and timers) with slowly varying values.
+Only the standard library is used, so it runs without Home Assistant.
+
+    python scripts/ups_simulator.py --count 10 --base-port 5020
+
+Every device gets its own port and serial number. ``--latency`` delays each
+response and ``--error-rate`` answers that share of requests with a Modbus
+exception, to see how the integration behaves on a slow or flaky link.
+``--hang-rate`` leaves that share of requests hanging: never answered, or
+with ``--hang-time`` answered that many seconds late, after the client has
+given up on them, so stale responses arrive on the connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+REGISTER_COUNT = 0x0110
+
+READ_HOLDING_REGISTERS = 0x03
+WRITE_SINGLE_REGISTER = 0x06
+WRITE_MULTIPLE_REGISTERS = 0x10
+
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_ADDRESS = 0x02
+DEVICE_FAILURE = 0x04
+
+_MBAP = struct.Struct(">HHHB")
+
+
+def _put_string(registers: list[int], address: int, words: int, text: str) -> None:
+    """Store ASCII text two characters per register."""
+    data = text.encode("ascii")[: words * 2].ljust(words * 2, b"\x00")
+    registers[address : address + words] = struct.unpack(f">{words}H", data)
+
+
+class SimulatedUPS:
+    """One simulated three-phase UPS."""
+
+    def __init__(
+        self,
+        serial: str,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang_time: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the register map."""
+        self.serial = serial
+        self.latency = latency
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_time = hang_time  # 0 never answers a hanging request
+        self.requests = 0
+        self.hangs = 0
+        self._random = random.Random(seed if seed is not None else serial)
+        self.registers = [0] * REGISTER_COUNT
+
+        regs = self.registers
+        _put_string(regs, 0x0000, 16, "EVER")
+        _put_string(regs, 0x0010, 32, "POWERLINE GREEN 33 PRO")
+        _put_string(regs, 0x0030, 8, "SIM 1.0")
+        _put_string(regs, 0x0038, 8, serial)
+
+        regs[0x0070] = (0 << 8) | 4  # online UPS, online mode
+        regs[0x0071] = (3 << 8) | 3  # three phases in and out
+        regs[0x0072] = (2 << 8) | 1  # battery normal, no test
+        regs[0x0073] = (1 << 8) | 3
+        regs[0x0074] = 2  # float charging
+
+        regs[0x0081] = 500
+        regs[0x00A5] = 45
+        regs[0x00A9] = 100
+        regs[0x00AA] = 2400
+        regs[0x00AB] = 2400
+        regs[0x00AD] = 500
+        regs[0x00B0] = 2300
+
+        regs[0x00E1] = 100  # 10 kVA
+        regs[0x00E2] = 4800
+        regs[0x00E4] = 2300
+        regs[0x00E5] = 500
+        regs[0x00E6] = 90  # 9 kW
+        regs[0x0101] = 120
+        regs[0x0103] = 60
+        self.update()
+
+    def update(self) -> None:
+        """Let the measurements drift a little, as on a real device."""
+        regs = self.registers
+        rnd = self._random
+        regs[0x0080] = 250 + rnd.randint(-5, 5)
+        for phase in range(3):
+            regs[0x0084 + phase] = 2300 + rnd.randint(-20, 20)
+            regs[0x0093 + phase] = 2300 + rnd.randint(-3, 3)
+            load = 30 + rnd.randint(-5, 5)
+            regs[0x0099 + phase] = 100 + rnd.randint(-10, 10)
+            regs[0x009C + phase] = load * 3 // 10
+            regs[0x009F + phase] = load * 3 // 10 + 1
+            regs[0x00A2 + phase] = load
+        regs[0x00A6] = rnd.randint(0, 59)
+
+    def handle(self, pdu: bytes) -> bytes:
+        """Answer one request PDU."""
+        self.requests += 1
+        function = pdu[0]
+        if self.error_rate and self._random.random() < self.error_rate:
+            return bytes((function | 0x80, DEVICE_FAILURE))
+
+        if function == READ_HOLDING_REGISTERS:
+            address, count = struct.unpack_from(">HH", pdu, 1)
+            if not 0 < count <= 125 or address + count > REGISTER_COUNT:
+                return bytes((function | 0x80, ILLEGAL_ADDRESS))
+            self.update()
+            values = self.registers[address : address + count]
+            return struct.pack(f">BB{count}H", function, count * 2, *values)
+
+        if function == WRITE_SINGLE_REGISTER:
+            address, value = struct.unpack_from(">HH", pdu, 1)
+            if address >= REGISTER_COUNT:
+                return bytes((function | 0x80, ILLEGAL_ADDRESS))
+            self.registers[address] = value
+            return pdu[:5]
+
+        if function == WRITE_MULTIPLE_REGISTERS:
+            address, count = struct.unpack_from(">HH", pdu, 1)
+            if not 0 < count <= 123 or address + count > REGISTER_COUNT:
+                return bytes((function | 0x80, ILLEGAL_ADDRESS))
+            values = struct.unpack_from(f">{count}H", pdu, 6)
+            self.registers[address : address + count] = values
+            return pdu[:5]
+
+        return bytes((function | 0x80, ILLEGAL_FUNCTION))
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve Modbus TCP requests until the client disconnects."""
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP.size)
+                transaction, protocol, length, unit = _MBAP.unpack(header)
+                pdu = await reader.readexactly(length - 1)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                response = self.handle(pdu)
+                if self.hang_rate and self._random.random() < self.hang_rate:
+                    self.hangs += 1
+                    if not self.hang_time:
+                        continue
+                    await asyncio.sleep(self.hang_time)
+                writer.write(
+                    _MBAP.pack(transaction, protocol, len(response) + 1, unit)
+                    + response
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def async_start_fleet(
+    count: int,
+    *,
+    host: str = "127.0.0.1",
+    base_port: int = 5020,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    hang_rate: float = 0.0,
+    hang_time: float = 0.0,
+) -> tuple[list[SimulatedUPS], list[asyncio.Server]]:
+    """Start ``count`` devices on consecutive ports."""
+    devices = []
+    servers = []
+    for index in range(count):
+        device = SimulatedUPS(
+            f"SIM{index:06d}",
+            latency=latency,
+            error_rate=error_rate,
+            hang_rate=hang_rate,
+            hang_time=hang_time,
+        )
+        servers.append(
+            await asyncio.start_server(
+                device.handle_connection, host, base_port + index
+            )
+        )
+        devices.append(device)
+    return devices, servers
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the simulators until interrupted."""
+    devices, servers = await async_start_fleet(
+        args.count,
+        host=args.host,
+        base_port=args.base_port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_time=args.hang_time,
+    )
+    _LOGGER.info(
+        "Simulating %d UPS on %s:%d-%d",
+        len(devices),
+        args.host,
+        args.base_port,
+        args.base_port + len(devices) - 1,
+    )
+    try:
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+    finally:
+        for server in servers:
+            server.close()
+
+
+def main() -> None:
+    """Parse arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=5020)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-time", type=float, default=0.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for the Ever Powerline UPS integration."""
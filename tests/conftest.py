@@ -0,0 +1,9 @@
+"""Shared test setup for Ever Powerline UPS."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+# The UPS simulator is a standalone script, not part of the integration
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
@@ -0,0 +1,177 @@
+"""Tests for the coordinator against the UPS simulator."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from ups_simulator import SimulatedUPS
+
+from custom_components.ever_powerline_ups.const import (
+    CONF_ALARM_INTERVAL,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SLAVE_ID,
+    DOMAIN,
+    REG_SERIAL,
+    REG_TIMERS,
+    REG_WARNINGS,
+    WARNING_POWER_FAIL,
+)
+from custom_components.ever_powerline_ups.coordinator import EverUPSCoordinator
+from custom_components.ever_powerline_ups.profile import async_get_profiles
+from custom_components.ever_powerline_ups.scheduler import (
+    RequestDeadlineError,
+    RequestPriority,
+)
+from homeassistant.core import HomeAssistant
+
+# The simulator listens on 127.0.0.1, the only host tests may connect to
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def _async_serve(device: SimulatedUPS, port: int = 0) -> asyncio.Server:
+    """Serve one simulated UPS on 127.0.0.1."""
+    return await asyncio.start_server(device.handle_connection, "127.0.0.1", port)
+
+
+async def _async_stop(server: asyncio.Server) -> None:
+    """Stop a simulator, late answers to abandoned requests included."""
+    server.close()
+    await server.wait_closed()
+
+
+async def _async_coordinator(hass: HomeAssistant, port: int) -> EverUPSCoordinator:
+    """Create a coordinator for a simulator and run its first poll."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: port},
+        options={CONF_SCAN_INTERVAL: 1, CONF_ALARM_INTERVAL: 0},
+        unique_id=f"127.0.0.1:{port}",
+    )
+    entry.add_to_hass(hass)
+    coordinator = EverUPSCoordinator(hass, entry, await async_get_profiles(hass))
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    return coordinator
+
+
+async def _read_serial(client: Any) -> list[int]:
+    """Read the serial number words."""
+    result = await client.read_holding_registers(
+        REG_SERIAL, count=8, device_id=DEFAULT_SLAVE_ID
+    )
+    return result.registers
+
+
+async def _async_wait_for(condition, timeout: float = 3.0) -> None:
+    """Wait until ``condition()`` holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.02)
+
+
+async def test_alarm_watcher_survives_failed_connect(hass: HomeAssistant) -> None:
+    """A refused reconnect backs the watcher off instead of ending it."""
+    device = SimulatedUPS("SIM000001")
+    server = await _async_serve(device)
+    port = server.sockets[0].getsockname()[1]
+    coordinator = await _async_coordinator(hass, port)
+
+    coordinator._reset_client()
+    await _async_stop(server)
+    watcher = asyncio.create_task(coordinator._async_watch_alarms(0.05))
+    try:
+        # Several reads fail to connect
+        await asyncio.sleep(0.5)
+        assert not watcher.done()
+
+        device.registers[REG_WARNINGS] |= WARNING_POWER_FAIL
+        server = await _async_serve(device, port)
+        await _async_wait_for(
+            lambda: coordinator.data["warnings_0"] & WARNING_POWER_FAIL
+        )
+        assert "power_fail" in coordinator.data["active_warnings"]
+    finally:
+        watcher.cancel()
+        await coordinator.async_close()
+        await _async_stop(server)
+
+
+async def test_deadline_miss_resyncs(hass: HomeAssistant) -> None:
+    """A read past its deadline reconnects, its late answer is never used."""
+    device = SimulatedUPS("SIM000001", hang_time=0.3)
+    server = await _async_serve(device)
+    coordinator = await _async_coordinator(hass, server.sockets[0].getsockname()[1])
+    serial = device.registers[REG_SERIAL : REG_SERIAL + 8]
+    try:
+        device.hang_rate = 1.0
+        with pytest.raises(RequestDeadlineError):
+            await coordinator._async_request(
+                RequestPriority.MEASUREMENT, _read_serial, deadline=0.1
+            )
+        assert coordinator._client is None
+
+        device.hang_rate = 0.0
+        # The late answer to the abandoned read arrives meanwhile
+        await asyncio.sleep(device.hang_time)
+        assert (
+            await coordinator._async_request(
+                RequestPriority.MEASUREMENT, _read_serial, deadline=0.1
+            )
+            == serial
+        )
+        assert await coordinator.async_read_registers(REG_TIMERS, 4) == (
+            device.registers[REG_TIMERS : REG_TIMERS + 4]
+        )
+    finally:
+        await coordinator.async_close()
+        await _async_stop(server)
+
+
+async def test_write_gets_through_while_read_hangs(hass: HomeAssistant) -> None:
+    """A control write waits for one read deadline, not the request timeout."""
+    device = SimulatedUPS("SIM000001")
+    server = await _async_serve(device)
+    coordinator = await _async_coordinator(hass, server.sockets[0].getsockname()[1])
+    try:
+        device.hang_rate = 1.0
+        read = asyncio.create_task(
+            coordinator._async_request(
+                RequestPriority.MEASUREMENT, _read_serial, deadline=0.3
+            )
+        )
+        await _async_wait_for(lambda: device.hangs)
+        device.hang_rate = 0.0
+
+        async with asyncio.timeout(1):
+            assert await coordinator.async_write_register(REG_TIMERS + 1, 30)
+        assert device.registers[REG_TIMERS + 1] == 30
+        with pytest.raises(RequestDeadlineError):
+            await read
+    finally:
+        await coordinator.async_close()
+        await _async_stop(server)
+
+
+async def test_reconnect_after_reset(hass: HomeAssistant) -> None:
+    """The poll after a dropped connection opens a new one."""
+    device = SimulatedUPS("SIM000001")
+    server = await _async_serve(device)
+    coordinator = await _async_coordinator(hass, server.sockets[0].getsockname()[1])
+    try:
+        client = coordinator._client
+        coordinator._reset_client()
+        assert coordinator._client is None
+
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator._client is not client
+        assert coordinator._client.connected
+        assert not coordinator.data["stale"]
+    finally:
+        await coordinator.async_close()
+        await _async_stop(server)
@@ -0,0 +1,224 @@
+"""Tests for the Modbus request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from custom_components.ever_powerline_ups.scheduler import (
+    ModbusScheduler,
+    RequestDeadlineError,
+    RequestPriority,
+    StaleRequestError,
+    async_get_scheduler,
+)
+from homeassistant.core import HomeAssistant
+
+
+class _Hang:
+    """A request that never completes and records its cancellation."""
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self) -> None:
+        self.started.set()
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def _result(value: Any):
+    """Return a request that completes with ``value``."""
+
+    async def _request() -> Any:
+        return value
+
+    return _request
+
+
+def test_deadline_raises_and_aborts() -> None:
+    """A request past its deadline fails and the link is resynchronised."""
+
+    async def _test() -> None:
+        scheduler = ModbusScheduler("test")
+        hang = _Hang()
+        aborts: list[str] = []
+
+        with pytest.raises(RequestDeadlineError):
+            await scheduler.async_submit(
+                "ups",
+                RequestPriority.MEASUREMENT,
+                hang,
+                key="read",
+                deadline=0.05,
+                on_abort=lambda: aborts.append("read"),
+            )
+        await asyncio.sleep(0)
+
+        assert aborts == ["read"]
+        assert hang.cancelled
+        # The link is free again straight away
+        assert (
+            await scheduler.async_submit(
+                "ups", RequestPriority.CONTROL, _result("written"), deadline=0.05
+            )
+            == "written"
+        )
+
+    asyncio.run(_test())
+
+
+def test_deadline_error_is_a_timeout() -> None:
+    """Callers catching TimeoutError also catch a missed deadline."""
+    assert issubclass(RequestDeadlineError, TimeoutError)
+
+
+def test_caller_cancel_aborts_running_request() -> None:
+    """Cancelling the caller of a running request frees the link."""
+
+    async def _test() -> None:
+        scheduler = ModbusScheduler("test")
+        hang = _Hang()
+        aborts: list[str] = []
+
+        caller = asyncio.create_task(
+            scheduler.async_submit(
+                "ups",
+                RequestPriority.ALARM,
+                hang,
+                deadline=60,
+                on_abort=lambda: aborts.append("alarm"),
+            )
+        )
+        await hang.started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        async with asyncio.timeout(1):
+            assert (
+                await scheduler.async_submit(
+                    "ups", RequestPriority.CONTROL, _result("written")
+                )
+                == "written"
+            )
+        assert hang.cancelled
+        assert aborts == ["alarm"]
+
+    asyncio.run(_test())
+
+
+def test_expired_request_is_not_sent() -> None:
+    """A request that waited longer than its max age is dropped."""
+
+    async def _test() -> None:
+        scheduler = ModbusScheduler("test")
+        hang = _Hang()
+        sent: list[str] = []
+
+        async def _read() -> None:
+            sent.append("read")
+
+        busy = asyncio.create_task(
+            scheduler.async_submit(
+                "ups", RequestPriority.CONTROL, hang, deadline=0.1
+            )
+        )
+        await hang.started.wait()
+        with pytest.raises(StaleRequestError, match="expired"):
+            await scheduler.async_submit(
+                "ups", RequestPriority.MEASUREMENT, _read, max_age=0.01
+            )
+        with pytest.raises(RequestDeadlineError):
+            await busy
+
+        assert not sent
+
+    asyncio.run(_test())
+
+
+def test_queued_request_is_superseded() -> None:
+    """A newer request with the same key replaces the queued one."""
+
+    async def _test() -> None:
+        scheduler = ModbusScheduler("test")
+        hang = _Hang()
+
+        busy = asyncio.create_task(
+            scheduler.async_submit(
+                "ups", RequestPriority.CONTROL, hang, deadline=0.1
+            )
+        )
+        await hang.started.wait()
+        first = asyncio.create_task(
+            scheduler.async_submit(
+                "ups", RequestPriority.MEASUREMENT, _result(1), key="poll"
+            )
+        )
+        await asyncio.sleep(0)
+        second = asyncio.create_task(
+            scheduler.async_submit(
+                "ups", RequestPriority.MEASUREMENT, _result(2), key="poll"
+            )
+        )
+
+        with pytest.raises(StaleRequestError, match="superseded"):
+            await first
+        assert await second == 2
+        with pytest.raises(RequestDeadlineError):
+            await busy
+
+    asyncio.run(_test())
+
+
+def test_priority_and_round_robin() -> None:
+    """Higher priorities go first, devices of a priority take turns."""
+
+    async def _test() -> None:
+        scheduler = ModbusScheduler("test")
+        hang = _Hang()
+        order: list[str] = []
+
+        def _record(name: str):
+            async def _request() -> None:
+                order.append(name)
+
+            return _request
+
+        busy = asyncio.create_task(
+            scheduler.async_submit("a", RequestPriority.CONTROL, hang, deadline=0.1)
+        )
+        await hang.started.wait()
+        requests = [
+            asyncio.create_task(
+                scheduler.async_submit(device, priority, _record(name))
+            )
+            for device, priority, name in (
+                ("a", RequestPriority.MEASUREMENT, "a1"),
+                ("a", RequestPriority.MEASUREMENT, "a2"),
+                ("b", RequestPriority.MEASUREMENT, "b1"),
+                ("b", RequestPriority.CONTROL, "write"),
+            )
+        ]
+        with pytest.raises(RequestDeadlineError):
+            await busy
+        await asyncio.gather(*requests)
+
+        assert order == ["write", "a1", "b1", "a2"]
+
+    asyncio.run(_test())
+
+
+async def test_scheduler_per_host_and_port(hass: HomeAssistant) -> None:
+    """Devices share a scheduler only on the same host and port."""
+    link = async_get_scheduler(hass, "192.0.2.10", 502)
+
+    assert async_get_scheduler(hass, "192.0.2.10", 502) is link
+    assert async_get_scheduler(hass, "192.0.2.10", 503) is not link
+    assert async_get_scheduler(hass, "192.0.2.11", 502) is not link
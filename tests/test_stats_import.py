@@ -0,0 +1,46 @@
+"""Tests for the long-term statistics import."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ever_powerline_ups.const import DOMAIN
+from custom_components.ever_powerline_ups.stats_import import (
+    HOUR,
+    StatisticsImporter,
+)
+from homeassistant.core import HomeAssistant
+
+
+async def test_unload_keeps_hours_being_imported(hass: HomeAssistant) -> None:
+    """An hour whose import is cut short by an unload is imported on setup."""
+    entry = MockConfigEntry(domain=DOMAIN, unique_id="SIM000001")
+    entry.add_to_hass(hass)
+    hass.config.components.add("recorder")
+    importer = StatisticsImporter(hass, entry, 10)
+    started = asyncio.Event()
+
+    async def _hang(hours: list) -> None:
+        started.set()
+        await asyncio.sleep(3600)
+
+    with patch.object(importer, "_async_import_hours", _hang):
+        importer.async_add({"load_total": 30}, 10 * HOUR + 5)
+        importer.async_add({"load_total": 40}, 11 * HOUR + 5)
+        await started.wait()
+        await importer.async_stop()
+
+    restored = StatisticsImporter(hass, entry, 10)
+    imported: list[int] = []
+
+    async def _import(hours: list) -> None:
+        imported.extend(start for start, _, _ in hours)
+
+    with patch.object(restored, "_async_import_hours", _import):
+        await restored.async_load()
+        await hass.async_block_till_done()
+
+    assert imported == [10 * HOUR]
@@ -0,0 +1,115 @@
+"""Tests for request deadlines against the UPS simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+
+import pytest
+from ups_simulator import SimulatedUPS
+
+from custom_components.ever_powerline_ups.scheduler import (
+    ModbusScheduler,
+    RequestDeadlineError,
+    RequestPriority,
+)
+
+# The simulator listens on 127.0.0.1, the only host tests may connect to
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+_MBAP = struct.Struct(">HHHB")
+SERIAL_ADDRESS = 56  # serial number words of the identifier block
+SERIAL_WORDS = 8
+
+
+class _Link:
+    """A minimal Modbus TCP client that reconnects after an abort."""
+
+    def __init__(self, port: int) -> None:
+        self._port = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._transaction = 0
+        self.connections = 0
+
+    async def read(self, address: int, count: int) -> list[int]:
+        """Read holding registers, fail on a response to another request."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                "127.0.0.1", self._port
+            )
+            self.connections += 1
+        self._transaction = (self._transaction + 1) & 0xFFFF
+        request = struct.pack(">BHH", 3, address, count)
+        self._writer.write(
+            _MBAP.pack(self._transaction, 0, len(request) + 1, 1) + request
+        )
+        await self._writer.drain()
+        transaction, _, length, _ = _MBAP.unpack(
+            await self._reader.readexactly(_MBAP.size)
+        )
+        pdu = await self._reader.readexactly(length - 1)
+        assert transaction == self._transaction, "stale response"
+        return list(struct.unpack_from(f">{count}H", pdu, 2))
+
+    def abort(self) -> None:
+        """Drop the connection, a late response must not reach a new read."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def test_recovers_from_hanging_requests() -> None:
+    """Hanging and late answers cost one request each, never a wrong result."""
+
+    async def _test() -> None:
+        device = SimulatedUPS("SIM000001", hang_rate=0.3, hang_time=0.2, seed=1)
+        server = await asyncio.start_server(device.handle_connection, "127.0.0.1", 0)
+        link = _Link(server.sockets[0].getsockname()[1])
+        scheduler = ModbusScheduler("simulator")
+        expected = device.registers[SERIAL_ADDRESS : SERIAL_ADDRESS + SERIAL_WORDS]
+
+        async def _read() -> list[int]:
+            return await link.read(SERIAL_ADDRESS, SERIAL_WORDS)
+
+        answered = missed = 0
+        try:
+            for _ in range(30):
+                try:
+                    registers = await scheduler.async_submit(
+                        "ups",
+                        RequestPriority.MEASUREMENT,
+                        _read,
+                        deadline=0.1,
+                        on_abort=link.abort,
+                    )
+                except RequestDeadlineError:
+                    missed += 1
+                    continue
+                assert registers == expected
+                answered += 1
+
+            assert device.hangs == missed > 0
+            assert answered > 0
+
+            device.hang_rate = 0.0
+            assert (
+                await scheduler.async_submit(
+                    "ups",
+                    RequestPriority.MEASUREMENT,
+                    _read,
+                    deadline=0.1,
+                    on_abort=link.abort,
+                )
+                == expected
+            )
+            # Every missed deadline resynchronised the link
+            assert link.connections == missed + 1
+        finally:
+            link.abort()
+            # Let the late answers to abandoned connections run out
+            await asyncio.sleep(device.hang_time * 2)
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(_test())